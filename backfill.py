@@ -0,0 +1,191 @@
+"""Backfill historical TES vs IRS spread curves over a process pool.
+
+The input is an .npz file with `dates` and `maturities` (datetime64[D]) and
+`yields` and `irs_rates` matrices (dates x bonds, NaN where a bond is not
+quoted). Inputs are placed in shared memory once and every worker fits a
+chunk of dates with fit_spread_curve. Each finished chunk is written to
+the output directory as its own .npy file, so an interrupted run resumes
+from the chunks that are missing. A manifest of the input's hash and the
+fit settings is kept next to the chunks, and a run whose settings differ
+refuses to reuse them unless --restart is given. Once every chunk is
+present they are assembled into curves.npy (dates x tenors).
+
+    python backfill.py history.npz curves/ --workers 8 --chunk-size 250
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from curve_fit import fit_spread_curve, STANDARD_TENORS
+from daycount import time_to_maturity, ACT_365F, CONVENTIONS
+
+CHUNKS_DIR = 'chunks'
+CURVES_FILE = 'curves.npy'
+DATES_FILE = 'dates.npy'
+TENORS_FILE = 'tenors.npy'
+MANIFEST_FILE = 'manifest.json'
+
+# Arrays each worker attaches to, keyed by name
+_shared = {}
+
+
+def _share(arrays):
+    """Copies arrays into new shared memory blocks and returns their specs"""
+    blocks, specs = [], {}
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, array.dtype, buffer=block.buf)[...] = array
+        blocks.append(block)
+        specs[name] = (block.name, array.shape, array.dtype.str)
+    return blocks, specs
+
+
+def _attach(specs):
+    """Pool initializer: maps the shared inputs into this worker"""
+    for name, (block_name, shape, dtype) in specs.items():
+        block = shared_memory.SharedMemory(name=block_name)
+        _shared[name] = (block, np.ndarray(shape, np.dtype(dtype), buffer=block.buf))
+
+
+def _chunk_path(output, start, end):
+    return os.path.join(output, CHUNKS_DIR, f'{start:08d}-{end:08d}.npy')
+
+
+def _file_hash(path):
+    """SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _check_manifest(output, manifest, restart):
+    """Makes sure existing chunks were fitted from the same input and settings.
+
+    Chunks from another run are deleted when `restart` is set; otherwise
+    a mismatch raises ValueError.
+    """
+    chunks_dir = os.path.join(output, CHUNKS_DIR)
+    path = os.path.join(output, MANIFEST_FILE)
+    existing = None
+    if os.path.exists(path):
+        with open(path) as f:
+            existing = json.load(f)
+    has_chunks = os.path.isdir(chunks_dir) and bool(os.listdir(chunks_dir))
+    if existing != manifest and (has_chunks or existing is not None):
+        if not restart:
+            changed = sorted(key for key in manifest
+                             if (existing or {}).get(key) != manifest[key])
+            raise ValueError(f"{output} holds chunks from a run with different "
+                             f"{', '.join(changed)}; use --restart to discard them")
+        shutil.rmtree(chunks_dir, ignore_errors=True)
+
+    os.makedirs(chunks_dir, exist_ok=True)
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, path)
+
+
+def _fit_chunk(start, end, output, frac, smoothing, day_count):
+    """Fits the curves for dates[start:end] and writes them to their chunk file"""
+    dates = _shared['dates'][1][start:end]
+    maturities = _shared['maturities'][1]
+    spread = _shared['yields'][1][start:end] - _shared['irs_rates'][1][start:end]
+
+    # Time to maturity over the whole chunk; matured bonds drop out of the fit
+    ttm = time_to_maturity(maturities.view('datetime64[D]'), dates.view('datetime64[D]'), day_count)
+    spread = np.where(ttm > 0, spread, np.nan)
+    curves = fit_spread_curve(ttm, spread, frac=frac, s=smoothing, tenors=STANDARD_TENORS)
+
+    path = _chunk_path(output, start, end)
+    tmp = path + '.tmp.npy'
+    np.save(tmp, curves)
+    os.replace(tmp, path)
+    return start, end
+
+
+def backfill(input_path, output, workers=None, chunk_size=250, frac=0.3, smoothing=0.05,
+             day_count=ACT_365F, restart=False):
+    """Fits every date in `input_path` and writes the curves under `output`"""
+    with np.load(input_path) as data:
+        inputs = {
+            'dates': data['dates'].astype('datetime64[D]').view(np.int64),
+            'maturities': data['maturities'].astype('datetime64[D]').view(np.int64),
+            'yields': data['yields'].astype(np.float64),
+            'irs_rates': data['irs_rates'].astype(np.float64),
+        }
+    n = len(inputs['dates'])
+    _check_manifest(output, {
+        'input_sha256': _file_hash(input_path),
+        'chunk_size': chunk_size,
+        'frac': frac,
+        'smoothing': smoothing,
+        'day_count': day_count,
+    }, restart)
+    np.save(os.path.join(output, DATES_FILE), inputs['dates'].view('datetime64[D]'))
+    np.save(os.path.join(output, TENORS_FILE), STANDARD_TENORS)
+
+    chunks = [(start, min(start + chunk_size, n)) for start in range(0, n, chunk_size)]
+    pending = [c for c in chunks if not os.path.exists(_chunk_path(output, *c))]
+    print(f"{len(chunks) - len(pending)} of {len(chunks)} chunks already done")
+
+    if pending:
+        blocks, specs = _share(inputs)
+        started = time.perf_counter()
+        try:
+            with ProcessPoolExecutor(workers, initializer=_attach, initargs=(specs,)) as pool:
+                futures = [pool.submit(_fit_chunk, start, end, output, frac, smoothing, day_count)
+                           for start, end in pending]
+                for done, future in enumerate(as_completed(futures), 1):
+                    start, end = future.result()
+                    print(f"[{done}/{len(pending)}] dates {start}-{end} "
+                          f"({time.perf_counter() - started:.1f}s)")
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+    # Assemble the chunks into a single dates x tenors matrix
+    curves = np.lib.format.open_memmap(os.path.join(output, CURVES_FILE), mode='w+',
+                                       dtype=np.float64, shape=(n, len(STANDARD_TENORS)))
+    for start, end in chunks:
+        curves[start:end] = np.load(_chunk_path(output, start, end))
+    curves.flush()
+    return os.path.join(output, CURVES_FILE)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('input', help=".npz file with dates, maturities, yields and irs_rates")
+    parser.add_argument('output', help="directory for the chunk files and curves.npy")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="worker processes (default: one per CPU)")
+    parser.add_argument('--chunk-size', type=int, default=250,
+                        help="dates per task")
+    parser.add_argument('--frac', type=float, default=0.3, help="LOESS span")
+    parser.add_argument('--smoothing', type=float, default=0.05, help="spline smoothing factor")
+    parser.add_argument('--day-count', choices=CONVENTIONS, default=ACT_365F,
+                        help="convention for time to maturity")
+    parser.add_argument('--restart', action='store_true',
+                        help="discard chunks fitted from another input or with other settings")
+    args = parser.parse_args(argv)
+    try:
+        path = backfill(args.input, args.output, args.workers, args.chunk_size,
+                        args.frac, args.smoothing, args.day_count, args.restart)
+    except ValueError as error:
+        parser.exit(1, f"{error}\n")
+    print(f"Wrote {path}")
+
+
+if __name__ == '__main__':
+    main()
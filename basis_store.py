@@ -0,0 +1,200 @@
+import numpy as np
+import pandas as pd
+
+METRIC_COLUMNS = ['Live', 'CoD', 'sigma', 'Z3m', 'Z6m', 'Z12m']
+COLUMNS = ['Bond', 'Country'] + METRIC_COLUMNS
+
+# Sample data for the sovereign universe, one entry per country
+SAMPLE_BASIS = {
+    'COLOMBIA': {
+        'Bond': ['COLOM 28s', 'COLOM 33s', 'COLOM 35s', 'COLOM 45s', 'COLOM 51s', 'COLOM 67s'],
+        'Live': [17, 17, 13, 9, 5, 8],
+        'CoD': [-2, -1, 1, -5, -4, -2],
+        'sigma': [2.1, 1.8, -1.2, 2.4, -1.7, 1.1],
+        'Z3m': [4.7, 1.8, 2.1, 1.6, 1.4, 1.2],
+        'Z6m': [4.3, 1.4, 2.5, 1.8, 1.2, 1.1],
+        'Z12m': [0.9, 0.8, 0.5, 1.2, 1.3, 1.5]
+    },
+    'BRAZIL': {
+        'Bond': ['BRAZIL 29s', 'BRAZIL 34s', 'BRAZIL 37s', 'BRAZIL 47s', 'BRAZIL 50s', 'BRAZIL 55s'],
+        'Live': [15, 14, 12, 8, 6, 5],
+        'CoD': [-1, -2, 1, -3, -2, -1],
+        'sigma': [1.8, 1.6, -1.2, 2.4, -1.7, 1.1],
+        'Z3m': [3.7, 1.6, 2.0, 1.4, 1.2, 1.0],
+        'Z6m': [3.3, 1.2, 2.3, 1.6, 1.0, 0.9],
+        'Z12m': [0.8, 0.7, 0.4, 1.0, 1.1, 0.8]
+    },
+    'MEXICO': {
+        'Bond': ['MEX 31s', 'MEX 34s', 'MEX 41s', 'MEX 47s', 'MEX 53s', 'MEX 61s'],
+        'Live': [12, 14, 11, 8, 7, 6],
+        'CoD': [-1, -2, 0, -2, -1, -1],
+        'sigma': [1.9, 1.7, -1.2, 2.4, -1.7, 1.1],
+        'Z3m': [2.8, 1.9, 2.1, 1.5, 1.3, 1.1],
+        'Z6m': [2.5, 1.7, 2.0, 1.4, 1.1, 0.9],
+        'Z12m': [0.7, 0.9, 0.6, 0.8, 1.0, 0.7]
+    },
+    'CHILE': {
+        'Bond': ['CHILE 29s', 'CHILE 32s', 'CHILE 42s', 'CHILE 50s', 'CHILE 61s', 'CHILE 71s'],
+        'Live': [10, 12, 9, 7, 6, 5],
+        'CoD': [-1, -1, -2, -1, -1, 0],
+        'sigma': [1.7, 1.5, -1.2, 2.4, -1.7, 1.1],
+        'Z3m': [1.9, 1.7, 1.5, 1.2, 1.0, 0.8],
+        'Z6m': [1.8, 1.5, 1.3, 1.0, 0.8, 0.6],
+        'Z12m': [0.6, 0.8, 0.7, 0.5, 0.4, 0.3]
+    },
+    'PERU': {
+        'Bond': ['PERU 30s', 'PERU 35s', 'PERU 40s', 'PERU 50s', 'PERU 55s', 'PERU 68s'],
+        'Live': [13, 15, 12, 9, 8, 7],
+        'CoD': [-2, -1, -2, -1, -1, 0],
+        'sigma': [1.9, 1.7, -1.2, 2.4, -1.7, 1.1],
+        'Z3m': [2.5, 2.1, -1.8, -1.4, 1.2, 1.0],
+        'Z6m': [2.3, 1.9, -1.6, 1.2, 1.0, 0.8],
+        'Z12m': [0.8, 1.0, -0.7, 0.6, 0.5, 0.4]
+    },
+    'PANAMA': {
+        'Bond': ['PANAMA 30s', 'PANAMA 36s', 'PANAMA 45s', 'PANAMA 53s', 'PANAMA 63s', 'PANAMA 68s'],
+        'Live': [16, 15, 11, 7, 6, 5],
+        'CoD': [-2, -1, 0, -4, -2, -1],
+        'sigma': [1.7, 1.3, -1.2, 2.4, -1.7, 1.1],
+        'Z3m': [4.2, 1.7, 2.2, 1.5, 1.3, 1.1],
+        'Z6m': [3.8, 1.3, 2.4, -1.7, -1.5, 1.2],
+        'Z12m': [0.9, 0.8, 0.6, 1.1, 0.9, 0.7]
+    },
+    'DOMREP': {
+        'Bond': ['DOMREP 29s', 'DOMREP 32s', 'DOMREP 41s', 'DOMREP 45s', 'DOMREP 55s', 'DOMREP 61s'],
+        'Live': [18, 16, 13, 10, 8, 7],
+        'CoD': [-3, -2, -1, -2, -1, -1],
+        'sigma': [2.8, 2.5, -1.2, 2.4, -1.7, 1.1],
+        'Z3m': [3.2, 2.8, 2.1, 1.7, 1.4, 1.2],
+        'Z6m': [2.9, -2.5, 1.9, 1.5, 1.2, 1.0],
+        'Z12m': [1.1, 0.9, 0.7, 0.6, 0.5, 0.4]
+    },
+}
+
+# Issuer metadata for the sidebar filters; ratings are letter grades without notches
+SOVEREIGN_SECTOR = 'SOV'
+COUNTRY_RATINGS = {
+    'COLOMBIA': 'BB',
+    'BRAZIL': 'BB',
+    'MEXICO': 'BBB',
+    'CHILE': 'A',
+    'PERU': 'BBB',
+    'PANAMA': 'BBB',
+    'DOMREP': 'BB',
+}
+
+
+class BasisStore:
+    """Columnar store of bond basis metrics.
+
+    Rows are kept grouped by country so a country is a contiguous slice of
+    every column, and bonds are resolved to row positions through a hash
+    index.
+    """
+
+    def __init__(self, frame):
+        missing = [c for c in COLUMNS if c not in frame.columns]
+        if missing:
+            raise ValueError(f"Missing basis columns: {missing}")
+        if frame['Bond'].duplicated().any():
+            raise ValueError("Bond names must be unique")
+
+        # Group rows by country, keeping countries in order of first appearance
+        countries = pd.unique(frame['Country'])
+        codes = pd.Categorical(frame['Country'], categories=countries).codes
+        order = np.argsort(codes, kind='stable')
+        frame = frame.iloc[order].reset_index(drop=True)
+
+        self._columns = {c: frame[c].to_numpy(copy=True) for c in COLUMNS}
+        self._index = pd.Index(self._columns['Bond'])
+        bounds = np.searchsorted(codes[order], np.arange(len(countries) + 1))
+        self._slices = {
+            country: slice(int(bounds[i]), int(bounds[i + 1]))
+            for i, country in enumerate(countries)
+        }
+        self.version = 0
+        self._column_versions = dict.fromkeys(METRIC_COLUMNS, 0)
+
+    @classmethod
+    def from_country_dicts(cls, data):
+        """Builds a store from a {country: {column: values}} mapping"""
+        frames = [pd.DataFrame({**columns, 'Country': country})
+                  for country, columns in data.items()]
+        return cls(pd.concat(frames, ignore_index=True))
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, bond):
+        return bond in self._index
+
+    @property
+    def countries(self):
+        return list(self._slices)
+
+    @property
+    def bonds(self):
+        return self._columns['Bond']
+
+    def column(self, name):
+        return self._columns[name]
+
+    def column_version(self, name):
+        """Count of updates written to a metric column"""
+        return self._column_versions[name]
+
+    def position(self, bond):
+        """Returns the row position of a bond"""
+        return self._index.get_loc(bond)
+
+    def positions(self, bonds):
+        """Returns the row position of each bond, -1 for bonds not in the store"""
+        return self._index.get_indexer(bonds)
+
+    def get(self, bond):
+        """Returns a single bond's metrics as a dict"""
+        i = self._index.get_loc(bond)
+        return {c: self._columns[c][i] for c in COLUMNS}
+
+    def country(self, country):
+        """Returns a country's rows as a dict of column views"""
+        rows = self._slices[country]
+        return {c: self._columns[c][rows] for c in COLUMNS}
+
+    def countries_at(self, positions):
+        """Returns {country: column dict} for the given rows, leaving out countries with none"""
+        positions = np.sort(np.asarray(positions, dtype=np.int64))
+        data = {}
+        for country, rows in self._slices.items():
+            lo, hi = np.searchsorted(positions, [rows.start, rows.stop])
+            if hi > lo:
+                data[country] = {c: self._columns[c][positions[lo:hi]] for c in COLUMNS}
+        return data
+
+    def frame(self):
+        return pd.DataFrame({c: self._columns[c] for c in COLUMNS})
+
+    def update(self, updates):
+        """Applies a bulk update.
+
+        `updates` is a DataFrame (or dict of arrays) with a 'Bond' column and
+        any subset of the metric columns.
+        """
+        updates = pd.DataFrame(updates)
+        positions = self._index.get_indexer(updates['Bond'])
+        if (positions < 0).any():
+            unknown = updates['Bond'][positions < 0].tolist()
+            raise KeyError(f"Unknown bonds: {unknown}")
+        self.update_positions(positions, **{
+            name: updates[name].to_numpy() for name in updates.columns if name != 'Bond'})
+
+    def update_positions(self, positions, **columns):
+        """Writes metric values at known row positions"""
+        for name in columns:
+            if name not in METRIC_COLUMNS:
+                raise KeyError(f"Unknown basis column: {name}")
+        for name, values in columns.items():
+            column = self._columns[name]
+            column[positions] = np.asarray(values).astype(column.dtype, copy=False)
+            self._column_versions[name] += 1
+        self.version += 1
@@ -0,0 +1,75 @@
+import pytest
+
+import dashboard
+from conftest import clear_caches, record
+
+CACHE_STATES = ['cold', 'warm']
+
+
+def _rounds(build, cache, clear):
+    """Wraps build so cold rounds start from empty caches"""
+    if cache == 'warm':
+        build()
+        return build
+
+    def cold_build():
+        clear()
+        return build()
+    return cold_build
+
+
+@pytest.mark.parametrize('cache', CACHE_STATES)
+def bench_create_basis_chart(benchmark, history, cache):
+    bond = history.bonds[0]
+    build = _rounds(lambda: dashboard.create_basis_chart(bond), cache, clear_caches)
+    record(benchmark, benchmark(build), build)
+
+
+def bench_update_basis_zoom(benchmark, history):
+    bond = history.bonds[0]
+    dates = history.dates
+    relayout = {'xaxis.range[0]': str(dates[len(dates) // 2]),
+                'xaxis.range[1]': str(dates[min(len(dates) // 2 + 252, len(dates) - 1)])}
+    dashboard.get_bond_series(bond, dashboard.figure_cache.dataset)
+    patch = benchmark(dashboard.update_basis_zoom, relayout, bond)
+    record(benchmark, patch, dashboard.update_basis_zoom, relayout, bond)
+
+
+@pytest.mark.parametrize('cache', CACHE_STATES)
+def bench_create_distribution_charts(benchmark, history, cache):
+    bond = history.bonds[0]
+    build = _rounds(lambda: dashboard.create_distribution_charts(bond), cache, clear_caches)
+    record(benchmark, benchmark(build), build)
+
+
+@pytest.mark.parametrize('cache', CACHE_STATES)
+def bench_update_chart(benchmark, history, cache):
+    # Invoked directly, as the background job does, with progress dropped
+    bond = history.bonds[0]
+    build = _rounds(lambda: dashboard.update_chart(lambda progress: None, bond), cache, clear_caches)
+    record(benchmark, benchmark(build), build)
+
+
+@pytest.mark.parametrize('cache', CACHE_STATES)
+def bench_create_sovereign_basis_table(benchmark, universe, cache):
+    # One table holding the whole universe, the worst case for a single render
+    data = {name: universe.column(name) for name in ('Bond', 'Live', 'CoD', 'sigma', 'Z3m', 'Z6m', 'Z12m')}
+    build = _rounds(lambda: dashboard.create_sovereign_basis_table('ALL', data), cache,
+                    dashboard.create_table_row.cache_clear)
+    record(benchmark, benchmark(build), build)
+
+
+@pytest.mark.parametrize('cache', CACHE_STATES)
+def bench_create_table_rows(benchmark, universe, cache):
+    # Every country table, as the initial layout renders them
+    build = _rounds(lambda: dashboard.create_table_rows(dashboard.get_all_country_data()), cache,
+                    dashboard.create_table_row.cache_clear)
+    record(benchmark, benchmark(build), build)
+
+
+def bench_bond_filter_matching(benchmark, universe):
+    bond_filter = dashboard.create_bond_filter()
+    args = ('c00', {'Rating': None}, {('Live',): 5, dashboard.ZSCORE_COLUMNS: 1.0})
+    positions = benchmark(bond_filter.matching, *args)
+    record(benchmark, positions, bond_filter.matching, *args)
+    benchmark.extra_info['matches'] = len(positions)
@@ -0,0 +1,110 @@
+"""Benchmarks for the dashboard's render and callback hot paths.
+
+Run from this directory; every run is saved as JSON under .benchmarks/:
+
+    pytest --bonds 10,1000,10000 --years 1,5,20
+    pytest --benchmark-compare --benchmark-compare-fail=mean:10%
+
+Table benchmarks are parametrized by universe size (--bonds) and chart
+benchmarks by history length (--years), since a chart only reads the
+selected bond's history. Serialized payload sizes and tracemalloc peaks
+are recorded in each benchmark's extra_info.
+"""
+import json
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import pytest
+from plotly.utils import PlotlyJSONEncoder
+
+import dashboard
+from basis_store import BasisStore, METRIC_COLUMNS
+from history_store import HistoryStore
+from figure_cache import FigureCache
+
+# Bonds per synthetic country, matching the sample tables
+BONDS_PER_COUNTRY = 6
+
+# Bonds given a history; charts are built for these
+CHARTED_BONDS = 4
+
+
+def pytest_addoption(parser):
+    parser.addoption('--bonds', default='10,1000', help="comma-separated universe sizes")
+    parser.addoption('--years', default='1,5', help="comma-separated history lengths")
+
+
+def pytest_generate_tests(metafunc):
+    for name, option in (('bonds', '--bonds'), ('years', '--years')):
+        if name in metafunc.fixturenames:
+            sizes = [int(size) for size in metafunc.config.getoption(option).split(',')]
+            metafunc.parametrize(name, sizes, ids=[f'{name}={size}' for size in sizes],
+                                 scope='module')
+
+
+def synthetic_universe(bonds, seed=0):
+    """A BasisStore of `bonds` bonds spread over countries of six"""
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({
+        'Bond': [f'C{i // BONDS_PER_COUNTRY:04d} {i % BONDS_PER_COUNTRY + 25}s' for i in range(bonds)],
+        'Country': [f'COUNTRY {i // BONDS_PER_COUNTRY:04d}' for i in range(bonds)],
+        'Live': rng.integers(0, 30, bonds),
+        'CoD': rng.integers(-5, 6, bonds),
+        **{name: rng.normal(0, 1.5, bonds).round(1) for name in METRIC_COLUMNS[2:]},
+    })
+    return BasisStore(frame)
+
+
+@pytest.fixture(scope='module')
+def universe(bonds):
+    """Swaps a synthetic universe into the dashboard for the module"""
+    saved = dashboard.basis_store
+    dashboard.basis_store = synthetic_universe(bonds)
+    dashboard.create_table_row.cache_clear()
+    yield dashboard.basis_store
+    dashboard.basis_store = saved
+    dashboard.create_table_row.cache_clear()
+
+
+@pytest.fixture(scope='module')
+def history(years):
+    """Swaps synthetic histories of `years` years into the dashboard for the module"""
+    saved = dashboard.history_store, dashboard.figure_cache
+    bonds = [f'BENCH {i}' for i in range(CHARTED_BONDS)]
+    dashboard.history_store = HistoryStore.synthetic(bonds, years=years)
+    dashboard.figure_cache = FigureCache(maxsize=256)
+    clear_caches()
+    yield dashboard.history_store
+    dashboard.history_store, dashboard.figure_cache = saved
+    clear_caches()
+
+
+def clear_caches():
+    """Forgets every memoized series, distribution and figure"""
+    dashboard.get_bond_series.cache_clear()
+    dashboard.get_bond_distributions.cache_clear()
+    dashboard.figure_cache.invalidate()
+
+
+def payload_bytes(value):
+    """Bytes a figure, component or tuple of them takes once serialized for the browser"""
+    if hasattr(value, 'to_plotly_json'):
+        value = value.to_plotly_json()
+    return len(json.dumps(value, cls=PlotlyJSONEncoder))
+
+
+def peak_memory(func, *args):
+    """Peak bytes allocated while running func once"""
+    tracemalloc.start()
+    try:
+        func(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def record(benchmark, result, func, *args):
+    """Stores the payload size and memory peak of a benchmarked call"""
+    benchmark.extra_info['payload_bytes'] = payload_bytes(result)
+    benchmark.extra_info['peak_memory_bytes'] = peak_memory(func, *args)
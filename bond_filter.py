@@ -0,0 +1,139 @@
+from collections import defaultdict
+
+import numpy as np
+
+# Length of the substrings indexed for name search
+GRAM = 3
+
+
+class BondFilter:
+    """Precomputed indexes answering the sidebar filters over a bond universe.
+
+    Every index answers with a packed bitmap (one bit per bond), so a filter
+    combination is a few byte-wise ANDs and ORs over n / 8 bytes:
+    trigram postings and sorted name tokens for search, one bitmap per
+    value of each category, and metric columns sorted once so thresholds
+    are a binary search plus a rank comparison.
+    """
+
+    def __init__(self, bonds, categories, metrics, versions=None):
+        self.bonds = np.asarray(bonds, dtype=object)
+        self.size = len(self.bonds)
+        self._names = np.array([str(bond).casefold() for bond in self.bonds])
+        self._all = self._bitmap(np.arange(self.size))
+        self._none = self._bitmap([])
+
+        # Trigram postings for substring search
+        postings = defaultdict(list)
+        for i, name in enumerate(self._names):
+            for gram in {name[j:j + GRAM] for j in range(len(name) - GRAM + 1)}:
+                postings[gram].append(i)
+        self._grams = {gram: self._bitmap(rows) for gram, rows in postings.items()}
+
+        # Sorted names and name tokens for prefix search of short queries
+        tokens = sorted({(token, i) for i, name in enumerate(self._names)
+                         for token in [name] + name.split()})
+        self._tokens = np.array([token for token, _ in tokens])
+        self._token_rows = np.array([i for _, i in tokens], dtype=np.int64)
+
+        # One bitmap per value of every category
+        self._categories = {}
+        for field, labels in categories.items():
+            labels = np.asarray(labels)
+            self._categories[field] = {value: self._bitmap(np.flatnonzero(labels == value))
+                                       for value in np.unique(labels).tolist()}
+
+        self._metrics = {}
+        self.versions = {}
+        self.update_metrics(metrics, versions)
+
+    def _bitmap(self, rows):
+        mask = np.zeros(self.size, dtype=bool)
+        mask[np.asarray(rows, dtype=np.int64)] = True
+        return np.packbits(mask)
+
+    def update_metrics(self, metrics, versions=None):
+        """Re-sorts the given metric columns, e.g. after live ticks changed them.
+
+        A column already indexed is re-sorted starting from its previous
+        order; ticks move few values, and the stable sort is adaptive, so
+        that is close to linear.
+        """
+        for name, values in metrics.items():
+            values = np.asarray(values, dtype=np.float64)
+            if name in self._metrics:
+                previous = self._metrics[name][3]
+                order = previous[np.argsort(values[previous], kind='stable')]
+            else:
+                order = np.argsort(values, kind='stable')
+            ranks = np.empty(self.size, dtype=np.int64)
+            ranks[order] = np.arange(self.size)
+            # NaNs sort last and never pass a threshold
+            self._metrics[name] = (values[order], ranks, int(np.isfinite(values).sum()), order)
+        self.versions.update(versions or {})
+
+    def search(self, query):
+        """Bonds whose name contains `query` (case-insensitive).
+
+        Queries shorter than a trigram match the start of the name or of
+        one of its words.
+        """
+        query = (query or '').strip().casefold()
+        if not query:
+            return self._all
+        if len(query) < GRAM:
+            lo = np.searchsorted(self._tokens, query, 'left')
+            hi = np.searchsorted(self._tokens, query + '\U0010ffff', 'left')
+            return self._bitmap(self._token_rows[lo:hi])
+
+        grams = {query[j:j + GRAM] for j in range(len(query) - GRAM + 1)}
+        if not grams <= self._grams.keys():
+            return self._none
+        candidates = np.bitwise_and.reduce([self._grams[gram] for gram in grams])
+        if len(query) == GRAM:
+            return candidates
+        # Trigrams can all occur without the whole query; confirm on the candidates
+        rows = self.rows(candidates)
+        return self._bitmap(rows[np.char.find(self._names[rows], query) >= 0])
+
+    def category(self, field, values):
+        """Bonds whose `field` is any of `values`; no values means no restriction"""
+        if values is None or values == [] or values == '':
+            return self._all
+        bitmaps = self._categories[field]
+        values = [values] if isinstance(values, str) else values
+        matches = [bitmaps[value] for value in values if value in bitmaps]
+        return np.bitwise_or.reduce(matches) if matches else self._none
+
+    def between(self, name, low=None, high=None):
+        """Bonds with low <= metric <= high"""
+        sorted_values, ranks, valid, _ = self._metrics[name]
+        lo = 0 if low is None else np.searchsorted(sorted_values[:valid], low, 'left')
+        hi = valid if high is None else np.searchsorted(sorted_values[:valid], high, 'right')
+        return np.packbits((ranks >= lo) & (ranks < hi))
+
+    def magnitude_at_least(self, names, threshold):
+        """Bonds where any of the metrics is at least `threshold` away from zero"""
+        threshold = abs(threshold)
+        return np.bitwise_or.reduce([bitmap for name in names for bitmap in
+                                     (self.between(name, low=threshold),
+                                      self.between(name, high=-threshold))])
+
+    def rows(self, bitmap):
+        """Row positions set in a bitmap, in order"""
+        return np.flatnonzero(np.unpackbits(bitmap, count=self.size))
+
+    def matching(self, search=None, categories=None, min_magnitudes=None):
+        """Row positions of the bonds passing every filter.
+
+        `categories` maps a field to its accepted value(s); `min_magnitudes`
+        maps a tuple of metrics to the smallest magnitude any of them must
+        reach. None values leave a filter off.
+        """
+        bitmaps = [self.search(search)]
+        for field, values in (categories or {}).items():
+            bitmaps.append(self.category(field, values))
+        for names, threshold in (min_magnitudes or {}).items():
+            if threshold is not None:
+                bitmaps.append(self.magnitude_at_least(names, threshold))
+        return self.rows(np.bitwise_and.reduce(bitmaps))
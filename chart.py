@@ -1,13 +1,13 @@
 import numpy as np
 import pandas as pd
 from datetime import datetime as dt
-from statsmodels.nonparametric.smoothers_lowess import lowess
-from scipy.interpolate import UnivariateSpline
-import matplotlib.pyplot as plt
+
+from curve_fit import loess_smooth, fit_splines, STANDARD_TENORS
+from daycount import time_to_maturity, ACT_365F
 
 # 1. Input TES and IRS data
 valuation_date = dt(2025, 4, 16)
-bonds_data = pd.DataFrame([
+sample_bonds = pd.DataFrame([
     {"mty": dt(2026, 8, 26), "yield": 9.148, "irs_rate": 8.4121},
     {"mty": dt(2027, 11, 3), "yield": 9.611, "irs_rate": 7.9838},
     {"mty": dt(2028, 4, 28), "yield": 10.081, "irs_rate": 8.0357},
@@ -22,34 +22,45 @@ bonds_data = pd.DataFrame([
     {"mty": dt(2046, 7, 25), "yield": 13.030, "irs_rate": 9.2702},
     {"mty": dt(2050, 10, 26), "yield": 12.949, "irs_rate": 9.291},
 ])
-bonds_data["ttm"] = bonds_data["mty"].apply(lambda x: (x - valuation_date).days / 365)
-bonds_data["spread"] = bonds_data["yield"] - bonds_data["irs_rate"]
-
-# 2. LOESS smoothing
-loess_result = lowess(bonds_data["spread"], bonds_data["ttm"], frac=0.3, return_sorted=True)
-ttm_smooth = loess_result[:, 0]
-spread_smooth = loess_result[:, 1]
-
-# 3. Penalized spline fit
-penalized_spline = UnivariateSpline(ttm_smooth, spread_smooth, s=0.05)
-
-# 4. Plot full curve with markers at annual tenors
-ttm_grid = np.linspace(min(ttm_smooth), max(ttm_smooth), 300)
-spread_fit = penalized_spline(ttm_grid)
-
-# Evaluate at standard tenors for markers
-standard_tenors = np.arange(1, 26, 1)
-spread_markers = penalized_spline(standard_tenors)
-
-# Plot
-plt.figure(figsize=(10, 6))
-plt.plot(bonds_data["ttm"], bonds_data["spread"], 'o', label="Observed Spreads")
-plt.plot(ttm_grid, spread_fit, '-', label="Penalized Spline Fit (P-spline)", linewidth=2)
-plt.plot(standard_tenors, spread_markers, 's', label="Annual Tenor Markers", color='red')
-plt.title("TES vs IRS Spread – Penalized Spline with Annual Markers")
-plt.xlabel("Time to Maturity (Years)")
-plt.ylabel("Spread (%)")
-plt.grid(True)
-plt.legend()
-plt.tight_layout()
-plt.show()
+
+
+def main():
+    """Fits the spread curve to the sample bonds and plots it"""
+    # matplotlib is only needed for the plot, so load it here
+    import matplotlib.pyplot as plt
+
+    bonds_data = sample_bonds.copy()
+    bonds_data["ttm"] = time_to_maturity(bonds_data["mty"], valuation_date, ACT_365F)
+    bonds_data["spread"] = bonds_data["yield"] - bonds_data["irs_rate"]
+
+    # 2. LOESS smoothing
+    ttm_smooth, spread_smooth = loess_smooth(bonds_data["ttm"], bonds_data["spread"], frac=0.3)
+    ttm_smooth, spread_smooth = ttm_smooth[0], spread_smooth[0]
+
+    # 3. Penalized spline fit
+    penalized_spline = fit_splines(ttm_smooth, spread_smooth, s=0.05)[0]
+
+    # 4. Plot full curve with markers at annual tenors
+    ttm_grid = np.linspace(min(ttm_smooth), max(ttm_smooth), 300)
+    spread_fit = penalized_spline(ttm_grid)
+
+    # Evaluate at standard tenors for markers
+    standard_tenors = STANDARD_TENORS
+    spread_markers = penalized_spline(standard_tenors)
+
+    # Plot
+    plt.figure(figsize=(10, 6))
+    plt.plot(bonds_data["ttm"], bonds_data["spread"], 'o', label="Observed Spreads")
+    plt.plot(ttm_grid, spread_fit, '-', label="Penalized Spline Fit (P-spline)", linewidth=2)
+    plt.plot(standard_tenors, spread_markers, 's', label="Annual Tenor Markers", color='red')
+    plt.title("TES vs IRS Spread – Penalized Spline with Annual Markers")
+    plt.xlabel("Time to Maturity (Years)")
+    plt.ylabel("Spread (%)")
+    plt.grid(True)
+    plt.legend()
+    plt.tight_layout()
+    plt.show()
+
+
+if __name__ == '__main__':
+    main()
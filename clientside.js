@@ -0,0 +1,39 @@
+// Browser-side callbacks registered in dashboard.py with ClientsideFunction
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    basis: {
+        // Shows the chart panel and highlights the clicked bond without a server round trip
+        select_bond: function(n_clicks, current_selected) {
+            const context = window.dash_clientside.callback_context;
+            const no_update = window.dash_clientside.no_update;
+            if (!context.triggered_id || !context.triggered.length || !context.triggered[0].value) {
+                throw window.dash_clientside.PreventUpdate;
+            }
+
+            // The triggering id carries the clicked bond
+            const bond_name = context.triggered_id.bond;
+
+            // Same classes as get_bond_name_class in dashboard.py
+            const base = "w-40 font-medium text-xs cursor-pointer transition-colors duration-150 ";
+            const selected = base + "text-blue-400 bg-gray-800 rounded px-1";
+            const unselected = base + "text-gray-100 hover:text-blue-400";
+
+            // Only send the class of the previously and newly selected bond names
+            const name_classes = context.outputs_list[3].map(function(output) {
+                if (output.id.bond === bond_name) {
+                    return selected;
+                }
+                if (output.id.bond === current_selected) {
+                    return unselected;
+                }
+                return no_update;
+            });
+
+            return [
+                {display: "block"},
+                "Historical Basis Evolution - " + bond_name,
+                bond_name,
+                name_classes
+            ];
+        }
+    }
+});
@@ -0,0 +1,120 @@
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+from numpy.lib.format import open_memmap
+
+from history_store import HistoryStore, DATES_FILE, VALUES_FILE, BONDS_FILE, write_meta
+
+SOURCE_FILE = 'source.json'
+
+
+def _file_hash(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _count_rows(path, block_size=1 << 20):
+    """Counts data rows by scanning for newlines, without parsing"""
+    lines, last = 0, b'\n'
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            lines += block.count(b'\n')
+            last = block[-1:]
+    if last != b'\n':
+        lines += 1
+    return max(lines - 1, 0)
+
+
+def sidecar_path(path):
+    return path + '.cache'
+
+
+def _sidecar_is_fresh(path, sidecar):
+    """Checks the sidecar against the CSV's size and mtime, falling back to its hash"""
+    try:
+        with open(os.path.join(sidecar, SOURCE_FILE)) as f:
+            source = json.load(f)
+    except (OSError, ValueError):
+        return False
+    stat = os.stat(path)
+    if stat.st_size != source['size']:
+        return False
+    if stat.st_mtime_ns == source['mtime_ns']:
+        return True
+
+    # Touched but possibly unchanged: compare contents and remember the new mtime
+    if _file_hash(path) != source['sha256']:
+        return False
+    source['mtime_ns'] = stat.st_mtime_ns
+    with open(os.path.join(sidecar, SOURCE_FILE), 'w') as f:
+        json.dump(source, f)
+    return True
+
+
+def _build_sidecar(path, sidecar, chunk_cells, dtype):
+    """Streams the CSV into a memory-mappable HistoryStore directory"""
+    stat = os.stat(path)
+    with open(path) as f:
+        columns = next(f).rstrip('\r\n').split(',')[1:]
+    n = _count_rows(path)
+
+    tmp = sidecar + '.tmp'
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    values = open_memmap(os.path.join(tmp, VALUES_FILE), mode='w+', dtype=dtype,
+                         shape=(n, len(columns)), fortran_order=True)
+    dates = np.empty(n, dtype='datetime64[D]')
+
+    names = ['date'] + [f'c{i}' for i in range(len(columns))]
+    chunksize = max(1, chunk_cells // max(len(columns), 1))
+    reader = pd.read_csv(path, header=None, skiprows=1, names=names, chunksize=chunksize,
+                         dtype={'date': str, **{name: dtype for name in names[1:]}})
+    rows = nonzero = 0
+    for chunk in reader:
+        end = rows + len(chunk)
+        dates[rows:end] = pd.to_datetime(chunk['date'], format='%Y-%m-%d').to_numpy()
+        block = chunk.iloc[:, 1:].to_numpy(dtype=dtype)
+        values[rows:end] = block
+        nonzero += np.count_nonzero(block)
+        rows = end
+    values.flush()
+
+    if rows != n:
+        # Blank lines made the newline count overshoot; rewrite at the real size
+        store = HistoryStore(dates[:rows], columns, np.asfortranarray(values[:rows]))
+        del values
+        store.write(tmp)
+    else:
+        del values
+        np.save(os.path.join(tmp, DATES_FILE), dates)
+        with open(os.path.join(tmp, BONDS_FILE), 'w') as f:
+            json.dump(columns, f)
+
+    # The CSV's hash and the dtype identify the matrix without hashing it again
+    sha256 = _file_hash(path)
+    write_meta(tmp, f'{sha256}-{np.dtype(dtype).name}', nonzero / max(rows * len(columns), 1))
+    with open(os.path.join(tmp, SOURCE_FILE), 'w') as f:
+        json.dump({'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': sha256}, f)
+    shutil.rmtree(sidecar, ignore_errors=True)
+    os.replace(tmp, sidecar)
+
+
+def load_wide_csv(path, chunk_cells=4_000_000, dtype=np.float32):
+    """Loads a wide daily CSV (date index, one column per ID) as a HistoryStore.
+
+    The first load streams the file in chunks of about `chunk_cells` values
+    into a float32 binary sidecar next to the CSV. Later loads memory-map
+    the sidecar and skip text parsing, unless the CSV's size or contents
+    changed.
+    """
+    sidecar = sidecar_path(path)
+    if not _sidecar_is_fresh(path, sidecar):
+        _build_sidecar(path, sidecar, chunk_cells, dtype)
+    return HistoryStore.open(sidecar)
@@ -0,0 +1,139 @@
+from functools import lru_cache
+
+import numpy as np
+
+# Annual tenors (years) the fitted curves are evaluated at
+STANDARD_TENORS = np.arange(1, 26, 1)
+
+
+def _neighborhood_weights(x, count, frac):
+    """Tricube LOESS weights for every (date, point, neighbour) triple.
+
+    `x` is (dates, n) sorted along each row with missing points at the
+    end, and `count` holds the number of valid points per row. Follows
+    statsmodels' lowess: each point uses the k = frac * count nearest
+    contiguous neighbours and the tricube of distance over the window
+    radius.
+    """
+    dates, n = x.shape
+    k = np.clip((frac * count + 1e-10).astype(np.int64), 2, np.maximum(count, 2))
+    k = np.minimum(k, count)[:, None]
+    j = np.arange(n)
+
+    # The window slides right while the point is past the midpoint of its ends
+    right = np.minimum(j[None, :] + k, n - 1)
+    mids = (x + np.take_along_axis(x, right, axis=1)) / 2.0
+    slidable = j[None, :] < (count[:, None] - k)
+    with np.errstate(invalid='ignore'):
+        past = slidable[:, None, :] & (x[:, :, None] > mids[:, None, :])
+    left = past.sum(axis=2)
+
+    in_window = (j[None, None, :] >= left[:, :, None]) & (j[None, None, :] < (left + k)[:, :, None])
+    x_left = np.take_along_axis(x, left, axis=1)
+    x_right = np.take_along_axis(x, np.minimum(left + k - 1, n - 1), axis=1)
+    radius = np.maximum(x - x_left, x_right - x)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        dist = np.abs(x[:, None, :] - x[:, :, None]) / radius[:, :, None]
+        weights = (1.0 - np.clip(dist, 0.0, 1.0) ** 3) ** 3
+    return np.where(in_window, weights, 0.0)
+
+
+@lru_cache(maxsize=64)
+def _shared_weights(ttm_key, n, frac):
+    """Weights for a tenor set shared by every date, computed once per tenor set"""
+    x = np.frombuffer(ttm_key, dtype=np.float64).reshape(1, n)
+    weights = _neighborhood_weights(x, np.array([n]), frac)
+    weights.setflags(write=False)
+    return weights
+
+
+def _sort_rows(ttm, spread):
+    """Sorts each row by ttm, moving missing points to the end"""
+    missing = ~(np.isfinite(ttm) & np.isfinite(spread))
+    order = np.argsort(np.where(missing, np.inf, ttm), axis=1, kind='stable')
+    x = np.take_along_axis(np.where(missing, np.nan, ttm), order, axis=1)
+    y = np.take_along_axis(np.where(missing, np.nan, spread), order, axis=1)
+    return x, y, (~missing).sum(axis=1)
+
+
+def loess_smooth(ttm, spread, frac=0.3, it=3):
+    """Robust LOWESS of spread against ttm for many dates at once.
+
+    `ttm` is either shared by every date (1-D) or given per date (2-D);
+    `spread` is (dates, bonds). Missing points are NaN. Matches
+    statsmodels' lowess(frac=frac, it=it). Returns (x, fitted), both
+    (dates, bonds) and sorted by ttm along each row, NaN-padded at the
+    end of rows with missing points.
+    """
+    spread = np.atleast_2d(np.asarray(spread, dtype=np.float64))
+    ttm = np.asarray(ttm, dtype=np.float64)
+    shared = ttm.ndim == 1
+    x, y, count = _sort_rows(np.broadcast_to(ttm, spread.shape), spread)
+    dates, n = y.shape
+
+    if shared and (count == n).all():
+        base = _shared_weights(np.ascontiguousarray(x[0]).tobytes(), n, frac)
+    else:
+        base = _neighborhood_weights(x, count, frac)
+
+    valid = np.arange(n)[None, :] < count[:, None]
+    y0 = np.where(valid, y, 0.0)
+    x0 = np.where(valid, x, 0.0)
+    resid_weights = np.ones((dates, n))
+    for _ in range(it + 1):
+        weights = base * resid_weights[:, None, :]
+        enough = (weights > 1e-12).sum(axis=2) >= 2
+        with np.errstate(invalid='ignore', divide='ignore'):
+            weights = weights / weights.sum(axis=2, keepdims=True)
+        weights = np.where(enough[:, :, None], weights, 0.0)
+
+        # Weighted local linear regression in projection form
+        mean_x = np.einsum('dij,dj->di', weights, x0)
+        dev = x0[:, None, :] - mean_x[:, :, None]
+        var_x = np.maximum(np.einsum('dij,dij->di', weights, dev * dev), 1e-12)
+        slope = (x0 - mean_x) / var_x
+        fitted = (np.einsum('dij,dj->di', weights, y0)
+                  + slope * np.einsum('dij,dij,dj->di', weights, dev, y0))
+        fitted = np.where(enough, fitted, y0)
+
+        # Bisquare robustness weights from the residuals
+        resid = np.where(valid, np.abs(y0 - fitted), np.nan)
+        median = np.nanmedian(resid, axis=1, keepdims=True)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            scaled = np.where(median == 0, (resid > 0).astype(np.float64), resid / (6.0 * median))
+        resid_weights = (1.0 - np.minimum(np.nan_to_num(scaled), 1.0) ** 2) ** 2
+
+    return x, np.where(valid, fitted, np.nan)
+
+
+def fit_splines(x, fitted, s=0.05):
+    """Fits a smoothing spline through each row of LOESS output.
+
+    Rows with fewer than four valid points get None.
+    """
+    # scipy is slow to import, so load it on first fit
+    from scipy.interpolate import UnivariateSpline
+
+    splines = []
+    for xs, ys in zip(np.atleast_2d(x), np.atleast_2d(fitted)):
+        valid = np.isfinite(xs) & np.isfinite(ys)
+        splines.append(UnivariateSpline(xs[valid], ys[valid], s=s) if valid.sum() > 3 else None)
+    return splines
+
+
+def fit_spread_curve(ttm, spread, frac=0.3, s=0.05, tenors=STANDARD_TENORS, it=3):
+    """Fits LOESS + smoothing-spline spread curves and evaluates them at `tenors`.
+
+    `spread` is one curve (bonds,) or many dates (dates, bonds); `ttm` is
+    either shared (bonds,) or per date like `spread`. Returns the curve
+    values at `tenors`, (len(tenors),) or (dates, len(tenors)).
+    """
+    single = np.ndim(spread) == 1
+    x, fitted = loess_smooth(ttm, spread, frac, it)
+    tenors = np.asarray(tenors, dtype=np.float64)
+    curves = np.full((len(x), len(tenors)), np.nan)
+    for i, spline in enumerate(fit_splines(x, fitted, s)):
+        if spline is not None:
+            curves[i] = spline(tenors)
+    return curves[0] if single else curves
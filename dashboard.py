@@ -1,110 +1,200 @@
 import plotly.graph_objects as go
 import numpy as np
-from dash import html, dcc, Input, Output, State, callback, ALL
+from dash import (html, dcc, Input, Output, State, callback, clientside_callback,
+                  ClientsideFunction, ctx, no_update, ALL, Patch, DiskcacheManager, hooks)
 from dash.exceptions import PreventUpdate
-from scipy import stats
-from datetime import datetime, timedelta
-
-# Sample data at module level
-colombia_data = {
-    'Bond': ['COLOM 28s', 'COLOM 33s', 'COLOM 35s', 'COLOM 45s', 'COLOM 51s', 'COLOM 67s'],
-    'Live': [17, 17, 13, 9, 5, 8],
-    'CoD': [-2, -1, 1, -5, -4, -2],
-    'sigma': [2.1, 1.8, -1.2, 2.4, -1.7, 1.1],
-    'Z3m': [4.7, 1.8, 2.1, 1.6, 1.4, 1.2],
-    'Z6m': [4.3, 1.4, 2.5, 1.8, 1.2, 1.1],
-    'Z12m': [0.9, 0.8, 0.5, 1.2, 1.3, 1.5]
-}
-
-brazil_data = {
-    'Bond': ['BRAZIL 29s', 'BRAZIL 34s', 'BRAZIL 37s', 'BRAZIL 47s', 'BRAZIL 50s', 'BRAZIL 55s'],
-    'Live': [15, 14, 12, 8, 6, 5],
-    'CoD': [-1, -2, 1, -3, -2, -1],
-    'sigma': [1.8, 1.6, -1.2, 2.4, -1.7, 1.1],
-    'Z3m': [3.7, 1.6, 2.0, 1.4, 1.2, 1.0],
-    'Z6m': [3.3, 1.2, 2.3, 1.6, 1.0, 0.9],
-    'Z12m': [0.8, 0.7, 0.4, 1.0, 1.1, 0.8]
-}
-
-mexico_data = {
-    'Bond': ['MEX 31s', 'MEX 34s', 'MEX 41s', 'MEX 47s', 'MEX 53s', 'MEX 61s'],
-    'Live': [12, 14, 11, 8, 7, 6],
-    'CoD': [-1, -2, 0, -2, -1, -1],
-    'sigma': [1.9, 1.7, -1.2, 2.4, -1.7, 1.1],
-    'Z3m': [2.8, 1.9, 2.1, 1.5, 1.3, 1.1],
-    'Z6m': [2.5, 1.7, 2.0, 1.4, 1.1, 0.9],
-    'Z12m': [0.7, 0.9, 0.6, 0.8, 1.0, 0.7]
-}
-
-chile_data = {
-    'Bond': ['CHILE 29s', 'CHILE 32s', 'CHILE 42s', 'CHILE 50s', 'CHILE 61s', 'CHILE 71s'],
-    'Live': [10, 12, 9, 7, 6, 5],
-    'CoD': [-1, -1, -2, -1, -1, 0],
-    'sigma': [1.7, 1.5, -1.2, 2.4, -1.7, 1.1],
-    'Z3m': [1.9, 1.7, 1.5, 1.2, 1.0, 0.8],
-    'Z6m': [1.8, 1.5, 1.3, 1.0, 0.8, 0.6],
-    'Z12m': [0.6, 0.8, 0.7, 0.5, 0.4, 0.3]
-}
-
-peru_data = {
-    'Bond': ['PERU 30s', 'PERU 35s', 'PERU 40s', 'PERU 50s', 'PERU 55s', 'PERU 68s'],
-    'Live': [13, 15, 12, 9, 8, 7],
-    'CoD': [-2, -1, -2, -1, -1, 0],
-    'sigma': [1.9, 1.7, -1.2, 2.4, -1.7, 1.1],
-    'Z3m': [2.5, 2.1, -1.8, -1.4, 1.2, 1.0],
-    'Z6m': [2.3, 1.9, -1.6, 1.2, 1.0, 0.8],
-    'Z12m': [0.8, 1.0, -0.7, 0.6, 0.5, 0.4]
-}
-
-panama_data = {
-    'Bond': ['PANAMA 30s', 'PANAMA 36s', 'PANAMA 45s', 'PANAMA 53s', 'PANAMA 63s', 'PANAMA 68s'],
-    'Live': [16, 15, 11, 7, 6, 5],
-    'CoD': [-2, -1, 0, -4, -2, -1],
-    'sigma': [1.7, 1.3, -1.2, 2.4, -1.7, 1.1],
-    'Z3m': [4.2, 1.7, 2.2, 1.5, 1.3, 1.1],
-    'Z6m': [3.8, 1.3, 2.4, -1.7, -1.5, 1.2],
-    'Z12m': [0.9, 0.8, 0.6, 1.1, 0.9, 0.7]
-}
-
-domrep_data = {
-    'Bond': ['DOMREP 29s', 'DOMREP 32s', 'DOMREP 41s', 'DOMREP 45s', 'DOMREP 55s', 'DOMREP 61s'],
-    'Live': [18, 16, 13, 10, 8, 7],
-    'CoD': [-3, -2, -1, -2, -1, -1],
-    'sigma': [2.8, 2.5, -1.2, 2.4, -1.7, 1.1],
-    'Z3m': [3.2, 2.8, 2.1, 1.7, 1.4, 1.2],
-    'Z6m': [2.9, -2.5, 1.9, 1.5, 1.2, 1.0],
-    'Z12m': [1.1, 0.9, 0.7, 0.6, 0.5, 0.4]
-}
-
-def create_basis_chart(bond_name=None):
-    # Generate dates for the last year (similar to the image timeframe)
-    dates = [(datetime.now() - timedelta(days=x)).date() for x in range(365)]
-    dates.reverse()
-
-    # Generate more realistic data
-    np.random.seed(42)  # For reproducibility
-    
-    # Base pattern for the main line
-    base_pattern = np.cumsum(np.random.normal(0, 0.2, 365)) + np.linspace(0, 1, 365)
+import diskcache
+import logging
+import os
+import tempfile
+import threading
+import uuid
+from functools import lru_cache
+
+from basis_store import BasisStore, SAMPLE_BASIS, SOVEREIGN_SECTOR, COUNTRY_RATINGS
+from bond_filter import BondFilter
+from rolling import rolling_mean_std
+from shared_cache import SharedCache
+from history_store import HistoryStore
+from sparse_series import SparseSeries
+from live_feed import TickLog, SimulatedFeed
+from zscores import compute_basis_zscores
+from distributions import basis_distributions, SHORT_HORIZONS, LONG_HORIZONS
+from plot_payload import typed_array, date_axis_values, MAX_CHART_POINTS
+from pyramid import HistoryPyramid
+from snapshot import Snapshot, SnapshotWatcher
+from instrumentation import instrumented, stage, register_cache, lru_stats
+
+logger = logging.getLogger(__name__)
+
+# End-of-day snapshot published by snapshot.py; with BASIS_SNAPSHOT_DIR set, the
+# tables, histories and precomputed chart data come from its latest version
+SNAPSHOT_DIR = os.environ.get("BASIS_SNAPSHOT_DIR")
+SNAPSHOT_POLL_S = float(os.environ.get("BASIS_SNAPSHOT_POLL_S", 30))
+
+def open_snapshot(path):
+    """Opens the latest snapshot, or returns None so the data is computed live until one is published"""
+    try:
+        return Snapshot.open(path)
+    except FileNotFoundError:
+        logger.warning("No snapshot published to %s yet; computing the data live", path)
+        return None
+
+snapshot = open_snapshot(SNAPSHOT_DIR) if SNAPSHOT_DIR else None
+
+# Columnar store backing every sovereign table
+basis_store = (BasisStore(snapshot.table_frame()) if snapshot
+               else BasisStore.from_country_dicts(SAMPLE_BASIS))
+
+# Histories with a smaller share of nonzero cells are held as a SparseSeries
+SPARSE_DENSITY = 0.1
+
+def open_history(path):
+    """Memory-maps a history directory, keeping only the nonzeros of mostly-zero histories"""
+    store = HistoryStore.open(path)
+    # The density is recorded when the directory is written
+    if store.density() < SPARSE_DENSITY:
+        return SparseSeries.from_history(store)
+    return store
+
+# Daily basis histories, memory-mapped from the snapshot or BASIS_HISTORY_DIR when set
+HISTORY_DIR = os.environ.get("BASIS_HISTORY_DIR")
+history_store = (snapshot.history if snapshot
+                 else open_history(HISTORY_DIR) if HISTORY_DIR
+                 else HistoryStore.synthetic(basis_store.bonds))
+
+# Number of country tables per row of the dashboard grid
+TABLES_PER_ROW = 4
+
+# Rolling window (in days) for the basis chart bands
+BASIS_WINDOW = 20
+
+# 'webgl' sends decimated binary arrays to Scattergl traces; 'svg' sends every point
+BASIS_RENDER_MODE = os.environ.get("BASIS_RENDER_MODE", "webgl")
+
+# Intraday Live/CoD ticks. With BASIS_LIVE_FEED set, a feed publishes them to a
+# tick log in BASIS_TICK_DIR that every worker process reads ('simulated' runs a
+# random producer in one of them); cells are refreshed at most once per LIVE_UPDATE_MS
+LIVE_FEED = os.environ.get("BASIS_LIVE_FEED")
+TICK_DIR = os.environ.get("BASIS_TICK_DIR", os.path.join(tempfile.gettempdir(), "basis-ticks"))
+LIVE_UPDATE_MS = int(os.environ.get("BASIS_LIVE_UPDATE_MS", 1000))
+tick_log = TickLog(TICK_DIR) if LIVE_FEED else None
+_tick_lock = threading.Lock()
+
+# Batches between checkpoints of every bond's Live/CoD, well inside the log's capacity
+TICK_CHECKPOINT_EVERY = 1024
+
+# (epoch, seq) of the last tick batch applied to basis_store
+_ticks_applied = (None, 0)
+
+# Serialized figures and bond analytics, read and filled by every worker process
+# on the host and by the chart jobs they start. Entries are keyed by the
+# snapshot version, or else the fingerprint recorded with the histories, so
+# they never outlive the data
+SHARED_CACHE_DIR = os.environ.get("BASIS_SHARED_CACHE_DIR",
+                                  os.path.join(tempfile.gettempdir(), "basis-cache"))
+dataset = snapshot.version if snapshot else history_store.fingerprint()
+figure_cache = SharedCache(SHARED_CACHE_DIR, ttl=15 * 60, dataset=dataset)
+
+# Local job manager running the chart callbacks in subprocesses; figures are
+# kept in figure_cache, so the manager itself caches nothing
+BACKGROUND_DIR = os.environ.get("BASIS_BACKGROUND_DIR",
+                                os.path.join(tempfile.gettempdir(), "basis-background"))
+background_manager = DiskcacheManager(diskcache.Cache(BACKGROUND_DIR))
+
+# Cache key for analytics computed over every bond at once
+ALL_BONDS = '*'
+
+def get_all_country_data():
+    """Returns each country's basis rows as column views into the store"""
+    sync_ticks()
+    return {country: basis_store.country(country) for country in basis_store.countries}
+
+# Metric columns the sidebar thresholds apply to
+FILTER_METRICS = ('Live', 'sigma', 'Z3m', 'Z6m', 'Z12m')
+
+def create_bond_filter():
+    """Builds the sidebar filter indexes over the bonds in the store"""
+    countries = basis_store.column('Country')
+    return BondFilter(
+        basis_store.bonds,
+        {'Sector': np.full(len(basis_store), SOVEREIGN_SECTOR),
+         'Rating': np.array([COUNTRY_RATINGS.get(c, '') for c in countries])},
+        {name: basis_store.column(name) for name in FILTER_METRICS},
+        versions={name: basis_store.column_version(name) for name in FILTER_METRICS})
+
+def get_bond_filter():
+    """Returns the filter indexes, re-sorting only the metrics updated since"""
+    sync_ticks()
+    with _tick_lock:
+        versions = {name: basis_store.column_version(name) for name in FILTER_METRICS}
+        stale = [name for name in FILTER_METRICS if bond_filter.versions.get(name) != versions[name]]
+        if stale:
+            bond_filter.update_metrics({name: basis_store.column(name) for name in stale},
+                                       {name: versions[name] for name in stale})
+    return bond_filter
+
+@lru_cache(maxsize=512)
+def get_bond_series(bond_name, dataset, window=BASIS_WINDOW):
+    """Returns (dates, basis, rolling mean, rolling std, pyramid) of a bond's history.
+
+    `dataset` is the identity of the data in use, so series a callback
+    computed from histories swapped out meanwhile are never served.
+    """
+    # Daily history for the bond, as views into the history store
+    with stage('fetch'):
+        dates, basis = history_store.history(bond_name)
     
-    # Calculate rolling mean and std
-    window = 20  # Rolling window size
-    rolling_mean = np.convolve(base_pattern, np.ones(window)/window, mode='valid')
+    # Calculate rolling mean and std over the same trailing window
+    with stage('stats'):
+        rolling_mean, rolling_std = rolling_mean_std(basis, window)
+        pyramid = HistoryPyramid(dates, basis)
+    return dates, basis, rolling_mean, rolling_std, pyramid
+
+def get_basis_trace_data(bond_name, start=None, end=None, window=BASIS_WINDOW,
+                         render_mode=BASIS_RENDER_MODE, max_points=MAX_CHART_POINTS):
+    """Returns the (x, y) of the ±2σ band, ±1σ band and basis traces between two dates"""
+    # The unzoomed WebGL view is precomputed in the snapshot
+    precomputed = (snapshot.chart_series(bond_name, window, max_points)
+                   if snapshot and render_mode == 'webgl' and start is None and end is None
+                   else None)
     
-    # Pad the rolling stats to match original length
-    pad_length = len(base_pattern) - len(rolling_mean)
-    rolling_mean = np.pad(rolling_mean, (pad_length, 0), 'edge')
+    if precomputed is not None:
+        dates, basis, rolling_mean, rolling_std = precomputed
+        rows = slice(None)
+        encode_x, encode_y = date_axis_values, typed_array
+    elif render_mode == 'webgl':
+        dates, basis, rolling_mean, rolling_std, pyramid = get_bond_series(bond_name, figure_cache.dataset, window)
+        # Pick the pyramid level that fits the window in about the chart's pixel width
+        rows = pyramid.window(start, end, max_points)
+        encode_x, encode_y = date_axis_values, typed_array
+    else:
+        dates, basis, rolling_mean, rolling_std, _ = get_bond_series(bond_name, figure_cache.dataset, window)
+        rows = slice(None)
+        encode_x = encode_y = np.asarray
+    dates, basis = dates[rows], basis[rows]
+    rolling_mean, rolling_std = rolling_mean[rows], rolling_std[rows]
     
-    # Calculate rolling standard deviation
-    rolling_std = np.array([np.std(base_pattern[max(0, i-window):i+1]) 
-                           for i in range(len(base_pattern))])
+    # Band polygons run forward along the upper edge and back along the lower one
+    band_dates = encode_x(np.concatenate([dates, dates[::-1]]))
+    return [
+        (band_dates, encode_y(np.concatenate([rolling_mean + 2*rolling_std, (rolling_mean - 2*rolling_std)[::-1]]))),
+        (band_dates, encode_y(np.concatenate([rolling_mean + rolling_std, (rolling_mean - rolling_std)[::-1]]))),
+        (encode_x(dates), encode_y(basis)),
+    ]
+
+def create_basis_chart(bond_name, window=BASIS_WINDOW, render_mode=BASIS_RENDER_MODE,
+                       max_points=MAX_CHART_POINTS):
+    two_std, one_std, main_line = get_basis_trace_data(
+        bond_name, window=window, render_mode=render_mode, max_points=max_points)
+    trace = go.Scattergl if render_mode == 'webgl' else go.Scatter
     
     fig = go.Figure()
     
     # Add 2 StdDev bands
-    fig.add_trace(go.Scatter(
-        x=dates + dates[::-1],
-        y=list(rolling_mean + 2*rolling_std) + list((rolling_mean - 2*rolling_std)[::-1]),
+    fig.add_trace(trace(
+        x=two_std[0],
+        y=two_std[1],
         fill='toself',
         fillcolor='rgba(255,165,0,0.1)',
         line=dict(color='rgba(255,165,0,0.5)', width=1, dash='dot'),
@@ -114,9 +204,9 @@ def create_basis_chart(bond_name=None):
     ))
     
     # Add 1 StdDev bands
-    fig.add_trace(go.Scatter(
-        x=dates + dates[::-1],
-        y=list(rolling_mean + rolling_std) + list((rolling_mean - rolling_std)[::-1]),
+    fig.add_trace(trace(
+        x=one_std[0],
+        y=one_std[1],
         fill='toself',
         fillcolor='rgba(0,255,0,0.1)',
         line=dict(color='rgba(0,255,0,0.5)', width=1, dash='dash'),
@@ -126,9 +216,9 @@ def create_basis_chart(bond_name=None):
     ))
     
     # Add main line
-    fig.add_trace(go.Scatter(
-        x=dates,
-        y=base_pattern,
+    fig.add_trace(trace(
+        x=main_line[0],
+        y=main_line[1],
         name='Difference',
         line=dict(
             color='rgb(0, 150, 255)',  # Bright blue color
@@ -156,6 +246,7 @@ def create_basis_chart(bond_name=None):
             bgcolor="rgba(0,0,0,0.5)"
         ),
         xaxis=dict(
+            type='date',
             showgrid=True,
             gridcolor='rgba(128,128,128,0.2)',
             tickformat='%b %Y',  # Format like in the image
@@ -171,16 +262,190 @@ def create_basis_chart(bond_name=None):
     
     return fig
 
+def create_empty_chart(message):
+    """Returns a blank chart showing a message, for bonds without a history"""
+    fig = go.Figure()
+    fig.add_annotation(text=message, showarrow=False, font=dict(color="#9CA3AF"))
+    fig.update_layout(
+        template="plotly_dark",
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+        margin=dict(l=10, r=10, t=10, b=10),
+        xaxis=dict(visible=False),
+        yaxis=dict(visible=False)
+    )
+    return fig
+
+def get_bond_name_class(is_selected):
+    """Returns the class for a bond name cell, highlighted when selected (mirrored in clientside.js)"""
+    return (f"w-40 font-medium text-xs cursor-pointer transition-colors duration-150 " + 
+            ("text-blue-400 bg-gray-800 rounded px-1" if is_selected else "text-gray-100 hover:text-blue-400"))
+
+def apply_ticks(bonds, live, cod):
+    """Writes Live/CoD ticks of the named bonds, skipping bonds not in the store"""
+    positions = basis_store.positions(bonds)
+    known = positions >= 0
+    basis_store.update_positions(positions[known], Live=live[known], CoD=cod[known])
+
+def sync_ticks():
+    """Applies the tick batches this process has not seen to the store; returns (epoch, seq)"""
+    global _ticks_applied
+    if tick_log is None:
+        return _ticks_applied
+    with _tick_lock:
+        epoch, seq = tick_log.epoch, tick_log.seq
+        applied = _ticks_applied[1] if _ticks_applied[0] == epoch else 0
+        if seq != applied:
+            batches = tick_log.read(applied, seq) if applied < seq else None
+            if batches is None:
+                # Further behind than the kept batches: start from the last checkpoint
+                checkpoint = tick_log.latest_checkpoint()
+                applied = checkpoint[0] if checkpoint else seq
+                if checkpoint:
+                    apply_ticks(*checkpoint[1:])
+                batches = tick_log.read(applied, seq) or []
+            for batch in batches:
+                apply_ticks(*batch)
+        _ticks_applied = (epoch, seq)
+        return _ticks_applied
+
+def publish_ticks(bonds, live, cod):
+    """Logs Live/CoD ticks of the named bonds for every worker process"""
+    seq = tick_log.append(bonds, live, cod)
+    if seq % TICK_CHECKPOINT_EVERY == 0:
+        sync_ticks()
+        with _tick_lock:
+            tick_log.checkpoint(_ticks_applied[1], basis_store.bonds, basis_store.column('Live'),
+                                basis_store.column('CoD'))
+
+def publish_moves(bonds, moves, owner):
+    """Publishes Live moves on top of the current values, if `owner` is the producer"""
+    if not tick_log.claim(owner):
+        return
+    sync_ticks()
+    with _tick_lock:
+        positions = basis_store.positions(bonds)
+        known = positions >= 0
+        positions, moves = positions[known], moves[known]
+        live = basis_store.column('Live')[positions] + moves
+        cod = basis_store.column('CoD')[positions] + moves
+        bonds = basis_store.bonds[positions]
+    publish_ticks(bonds, live, cod)
+
+simulated_feed = None
+
+def start_simulated_feed(rate=1000):
+    """Starts a random tick producer; one process on the host at a time publishes"""
+    global simulated_feed
+    owner = uuid.uuid4().hex
+    simulated_feed = SimulatedFeed(lambda bonds, moves: publish_moves(bonds, moves, owner),
+                                   basis_store.bonds, rate=rate)
+    simulated_feed.start()
+    return simulated_feed
+
+def refresh_zscores():
+    """Recomputes the sigma and Z columns of the tables from the histories"""
+    frame = figure_cache.get_or_compute(
+        ALL_BONDS, ('zscores',),
+        lambda: compute_basis_zscores(history_store.values, history_store.bonds))
+    basis_store.update(frame[frame['Bond'].isin(basis_store.bonds)])
+
+# Snapshots carry z-scores computed by the pipeline
+if snapshot is None:
+    refresh_zscores()
+bond_filter = create_bond_filter()
+
+def load_snapshot(path=SNAPSHOT_DIR, version=None):
+    """Swaps in a snapshot version (the latest by default).
+
+    Shared cache entries are keyed by the snapshot version, so nothing is
+    invalidated: workers still on the previous version keep reading and
+    filling its entries, and the old ones age out. This process's own
+    memoized series are keyed by the version too, and dropped to free them.
+    """
+    global snapshot, basis_store, history_store, bond_filter, _ticks_applied
+    new_snapshot = Snapshot.open(path, version)
+    new_store = BasisStore(new_snapshot.table_frame())
+    with _tick_lock:
+        snapshot, basis_store, history_store = new_snapshot, new_store, new_snapshot.history
+        figure_cache.dataset = new_snapshot.version
+        get_bond_series.cache_clear()
+        get_bond_distributions.cache_clear()
+        bond_filter = create_bond_filter()
+        # The new store starts from the snapshot's values; the day's ticks are applied again
+        _ticks_applied = (None, 0)
+        if simulated_feed is not None:
+            simulated_feed.bonds = new_store.bonds
+
+def start_snapshot_watcher(interval=SNAPSHOT_POLL_S):
+    """Starts a thread loading each new snapshot version once it is published"""
+    watcher = SnapshotWatcher(SNAPSHOT_DIR, lambda version: load_snapshot(SNAPSHOT_DIR, version),
+                              snapshot.version if snapshot else None, interval)
+    watcher.start()
+    return watcher
+
+_threads_lock = threading.Lock()
+_threads_pid = None
+
+def start_background_threads():
+    """Starts the configured tick feed and snapshot watcher, once per process"""
+    global _threads_pid
+    with _threads_lock:
+        if _threads_pid == os.getpid():
+            return
+        _threads_pid = os.getpid()
+    if LIVE_FEED == "simulated":
+        start_simulated_feed()
+    if SNAPSHOT_DIR:
+        start_snapshot_watcher()
+
+# Threads start with the first request a process serves. Started at import,
+# they would run in a preloading gunicorn master, whose threads do not survive
+# the fork into its workers, and chart jobs would be forked while they run
+@hooks.setup()
+def start_threads_on_first_request(app):
+    app.server.before_request(start_background_threads)
+
 def create_clickable_bond_name(bond_name, selected_bond=None):
-    is_selected = bond_name == selected_bond
     return html.Div(
         bond_name, 
-        className=f"w-40 font-medium text-xs cursor-pointer transition-colors duration-150 " + 
-                 ("text-blue-400 bg-gray-800 rounded px-1" if is_selected else "text-gray-100 hover:text-blue-400"),
+        className=get_bond_name_class(bond_name == selected_bond),
         id={'type': 'bond-name', 'bond': bond_name}
     )
 
+# Metric columns rendered as z-score cells, in table order
+ZSCORE_COLUMNS = ('sigma', 'Z3m', 'Z6m', 'Z12m')
+
+# Sized well above the bond universe so a full re-render never evicts its own rows
+@lru_cache(maxsize=16384)
+def create_table_row(bond, live, cod, cod_class, metrics, metric_classes, is_selected=False):
+    """Returns one bond's table row from its formatted cells, reused while they don't change"""
+    return html.Div([
+        create_clickable_bond_name(bond, bond if is_selected else None),
+        html.Div(
+            html.Div([
+                html.Div(live, 
+                        className="w-9 text-center text-sm font-medium",
+                        id={'type': 'live-cell', 'bond': bond}),
+                html.Div(cod, 
+                        className=cod_class,
+                        id={'type': 'cod-cell', 'bond': bond}),
+                *[html.Div(text, className=f"w-9 text-center text-sm {color_class}")
+                  for text, color_class in zip(metrics, metric_classes)],
+            ], className="flex gap-[3px]")
+        ),
+    ], className="flex justify-between items-center py-0.5 hover:bg-gray-800")
+
 def create_sovereign_basis_table(country, data, selected_bond=None):
+    # Format and classify whole columns at once
+    bonds = np.asarray(data['Bond']).tolist()
+    live = np.char.mod('%d', data['Live']).tolist()
+    cod = np.char.mod('%+d', data['CoD']).tolist()
+    cod_classes = get_cod_cell_classes(data['CoD']).tolist()
+    metrics = list(zip(*[np.char.mod('%.1f', data[column]).tolist() for column in ZSCORE_COLUMNS]))
+    metric_classes = list(zip(*[get_zscore_color_classes(data[column]).tolist()
+                                for column in ZSCORE_COLUMNS]))
+    
     return html.Div([
         # Table Header
         html.Div([
@@ -202,99 +467,87 @@ def create_sovereign_basis_table(country, data, selected_bond=None):
         
         # Table Body
         html.Div([
-            *[html.Div([
-                create_clickable_bond_name(data['Bond'][i], selected_bond),
-                html.Div(
-                    html.Div([
-                        html.Div(f"{data['Live'][i]}", 
-                                className="w-9 text-center text-sm font-medium"),
-                        html.Div(f"{data['CoD'][i]:+d}", 
-                                className=f"w-9 text-center text-sm {get_color_class(data['CoD'][i])}"),
-                        html.Div(f"{data['sigma'][i]:.1f}",
-                                className=f"w-9 text-center text-sm {get_zscore_color_class(data['sigma'][i])}"),
-                        html.Div(f"{data['Z3m'][i]:.1f}", 
-                                className=f"w-9 text-center text-sm {get_zscore_color_class(data['Z3m'][i])}"),
-                        html.Div(f"{data['Z6m'][i]:.1f}", 
-                                className=f"w-9 text-center text-sm {get_zscore_color_class(data['Z6m'][i])}"),
-                        html.Div(f"{data['Z12m'][i]:.1f}", 
-                                className=f"w-9 text-center text-sm {get_zscore_color_class(data['Z12m'][i])}"),
-                    ], className="flex gap-[3px]")
-                ),
-            ], className="flex justify-between items-center py-0.5 hover:bg-gray-800")
-            for i in range(len(data['Bond']))],
+            create_table_row(bonds[i], live[i], cod[i], cod_classes[i], metrics[i],
+                             metric_classes[i], bonds[i] == selected_bond)
+            for i in range(len(bonds))
         ], className="text-gray-100"),
     ], className="bg-gray-900 p-4 rounded-lg")
 
+# Cell colors as (sign, threshold, class): the first rule with sign * value > threshold applies
+CHANGE_COLORS = ((1, 0, "text-green-500"), (-1, 0, "text-red-500"))
+ZSCORE_COLORS = (
+    (1, 2, "text-green-600 font-medium"), (1, 1, "text-green-500 font-medium"), (1, 0, "text-green-400"),
+    (-1, 2, "text-red-600 font-medium"), (-1, 1, "text-red-500 font-medium"), (-1, 0, "text-red-400"),
+)
+NEUTRAL_COLOR = "text-gray-100"
+
+def color_classes(values, rules):
+    """Returns the color class of every value under the given rules"""
+    values = np.asarray(values, dtype=np.float64)
+    return np.select([sign * values > threshold for sign, threshold, _ in rules],
+                     [color for _, _, color in rules], NEUTRAL_COLOR)
+
+def color_class(value, rules):
+    """Returns the color class of a single value under the given rules"""
+    return next((color for sign, threshold, color in rules if sign * value > threshold), NEUTRAL_COLOR)
+
+def get_color_classes(values):
+    """Returns the color class of every value: green above zero, red below"""
+    return color_classes(values, CHANGE_COLORS)
+
 def get_color_class(value):
     """Returns appropriate color class based on value"""
-    if value > 0:
-        return "text-green-500"
-    elif value < 0:
-        return "text-red-500"
-    return "text-gray-100"
-
-def get_zscore_color_class(value):
-    """Returns appropriate color class based on z-score value and magnitude"""
-    if value > 2:
-        return "text-green-600 font-medium"
-    elif value > 1:
-        return "text-green-500 font-medium"
-    elif value > 0:
-        return "text-green-400"
-    elif value < -2:
-        return "text-red-600 font-medium"
-    elif value < -1:
-        return "text-red-500 font-medium"
-    elif value < 0:
-        return "text-red-400"
-    return "text-gray-100"
-
-def create_distribution_charts(bond_name=None):
-    # Generate sample data
-    np.random.seed(42)
-    
-    # Short-term distributions
-    current_spread = -0.45
-    x = np.linspace(-0.8, 0, 100)
+    return color_class(value, CHANGE_COLORS)
+
+def get_cod_cell_classes(values):
+    """Returns the classes of a column of change-on-day cells"""
+    return np.char.add("w-9 text-center text-sm ", get_color_classes(values))
+
+def get_cod_cell_class(value):
+    """Returns the class for a change-on-day cell"""
+    return f"w-9 text-center text-sm {get_color_class(value)}"
+
+def get_zscore_color_classes(values):
+    """Returns the color class of every z-score, stronger with its magnitude"""
+    return color_classes(values, ZSCORE_COLORS)
+
+@lru_cache(maxsize=512)
+def get_bond_distributions(bond_name, dataset):
+    """Returns (current, grids, densities) for every distribution horizon of a bond.
+
+    Keyed by `dataset` as get_bond_series is.
+    """
+    horizons = SHORT_HORIZONS + LONG_HORIZONS
+    precomputed = snapshot.distributions(bond_name, horizons) if snapshot is not None else None
+    if precomputed is not None:
+        return precomputed
     
-    # Create different distributions with increasing variance
-    dist_30d = stats.norm.pdf(x, current_spread, 0.05)
-    dist_60d = stats.norm.pdf(x, current_spread, 0.08)
-    dist_90d = stats.norm.pdf(x, current_spread, 0.08)
+    # Horizons are calendar days, read against the history's dates
+    def compute():
+        with stage('fetch'):
+            dates, basis = history_store.history(bond_name)
+        with stage('stats'):
+            return basis_distributions(basis, horizons, dates=dates)
+    return figure_cache.get_or_compute(bond_name, ('distributions', 'days', horizons), compute)
+
+def create_distribution_charts(bond_name):
+    current, grids, densities = get_bond_distributions(bond_name, figure_cache.dataset)
+    colors = ['#1f77b4', '#ff7f0e', '#2ca02c']
     
     short_term_fig = go.Figure()
-    
-    # Add distributions
-    short_term_fig.add_trace(go.Scatter(x=x, y=dist_30d, name='30-day Distribution',
-                                      line=dict(color='#1f77b4')))
-    short_term_fig.add_trace(go.Scatter(x=x, y=dist_60d, name='60-day Distribution',
-                                      line=dict(color='#ff7f0e')))
-    short_term_fig.add_trace(go.Scatter(x=x, y=dist_90d, name='90-day Distribution',
-                                      line=dict(color='#2ca02c')))
-    
-    # Add vertical line for current spread
-    short_term_fig.add_vline(x=current_spread, line_dash="dash", line_color="red",
-                           annotation_text=f"Current: {current_spread}")
-    
-    # Long-term distributions
-    x_long = np.linspace(-2.5, 1.5, 100)
-    dist_180d = stats.norm.pdf(x_long, current_spread, 0.3)
-    dist_360d = stats.norm.pdf(x_long, current_spread, 0.4)
-    dist_540d = stats.norm.pdf(x_long, current_spread, 0.5)
-    
     long_term_fig = go.Figure()
     
-    # Add distributions
-    long_term_fig.add_trace(go.Scatter(x=x_long, y=dist_180d, name='180-day Distribution',
-                                     line=dict(color='#1f77b4')))
-    long_term_fig.add_trace(go.Scatter(x=x_long, y=dist_360d, name='360-day Distribution',
-                                     line=dict(color='#ff7f0e')))
-    long_term_fig.add_trace(go.Scatter(x=x_long, y=dist_540d, name='540-day Distribution',
-                                     line=dict(color='#2ca02c')))
-    
-    # Add vertical line for current spread
-    long_term_fig.add_vline(x=current_spread, line_dash="dash", line_color="red",
-                          annotation_text=f"Current: {current_spread}")
+    # Add distributions, one trace per horizon
+    for fig, horizons, offset in [(short_term_fig, SHORT_HORIZONS, 0),
+                                  (long_term_fig, LONG_HORIZONS, len(SHORT_HORIZONS))]:
+        for i, horizon in enumerate(horizons):
+            fig.add_trace(go.Scatter(x=grids[offset + i], y=densities[offset + i],
+                                     name=f'{horizon}-day Distribution',
+                                     line=dict(color=colors[i])))
+        
+        # Add vertical line for current spread
+        fig.add_vline(x=current, line_dash="dash", line_color="red",
+                      annotation_text=f"Current: {current:.1f}")
     
     # Update layouts
     for fig in [short_term_fig, long_term_fig]:
@@ -326,34 +579,59 @@ def create_distribution_charts(bond_name=None):
     
     return short_term_fig, long_term_fig
 
+def create_table_rows(country_data, selected_bond=None):
+    """Splits the country tables into the two dashboard rows"""
+    tables = [create_sovereign_basis_table(country, data, selected_bond)
+              for country, data in country_data.items()]
+    first_row = tables[:TABLES_PER_ROW]
+    second_row = tables[TABLES_PER_ROW:]
+    # Pad the last row so the grid keeps its column widths
+    second_row += [html.Div(className="bg-transparent")
+                   for _ in range(-len(second_row) % TABLES_PER_ROW)]
+    return first_row, second_row
+
+# Unfiltered table rows of the last layout, keyed by the store they were built from
+_initial_tables = (None, None)
+
+def get_initial_tables():
+    """Returns the unfiltered table rows, rebuilt only after the store has changed"""
+    global _initial_tables
+    key = (basis_store, basis_store.version)
+    if _initial_tables[0] != key:
+        _initial_tables = (key, create_table_rows(get_all_country_data()))
+    return _initial_tables[1]
+
+def live_cursor():
+    """Returns the tick cursor of the values the store holds, for a page to start from"""
+    return [figure_cache.dataset, *sync_ticks()] if tick_log is not None else None
+
 def create_dashboard():
-    # Fetch initial data for all countries at once
-    initial_data = get_all_country_data()
+    # Page loads reuse the tables until a tick or a new snapshot changes them
+    cursor = live_cursor()
+    first_row, second_row = get_initial_tables()
     
     return html.Div([
         # Main content wrapper with flex
         html.Div([
             dcc.Store(id='selected-bond', data=None),
+            dcc.Store(id='live-seq', data=cursor),
+            dcc.Interval(id='live-interval', interval=LIVE_UPDATE_MS, disabled=tick_log is None),
             html.Div([
                 # Tables container
                 html.Div([
                     # First row of tables
-                    html.Div([
-                        create_sovereign_basis_table("COLOMBIA", initial_data["COLOMBIA"]),
-                        create_sovereign_basis_table("BRAZIL", initial_data["BRAZIL"]),
-                        create_sovereign_basis_table("MEXICO", initial_data["MEXICO"]),
-                        create_sovereign_basis_table("CHILE", initial_data["CHILE"]),
-                    ], className="grid grid-cols-4 gap-4 mb-0", id='first-row-tables'),
+                    html.Div(first_row, className="grid grid-cols-4 gap-4 mb-0", id='first-row-tables'),
                     
                     # Second row of tables
-                    html.Div([
-                        create_sovereign_basis_table("PERU", initial_data["PERU"]),
-                        create_sovereign_basis_table("PANAMA", initial_data["PANAMA"]),
-                        create_sovereign_basis_table("DOMREP", initial_data["DOMREP"]),
-                        html.Div(className="bg-transparent")
-                    ], className="grid grid-cols-4 gap-4 mb-6", id='second-row-tables'),
+                    html.Div(second_row, className="grid grid-cols-4 gap-4 mb-6", id='second-row-tables'),
                 ], className="px-6"),
                 
+                # Chart job progress, shown while the figures are built
+                html.Div(
+                    html.Progress(id="chart-progress", value="0", max="2", className="w-full h-1"),
+                    id="chart-progress-container", className="px-6 mb-2", style={'display': 'none'}
+                ),
+                
                 # Charts container with Loading wrapper
                 dcc.Loading(
                     id="loading-charts",
@@ -368,7 +646,7 @@ def create_dashboard():
                         
                         # Distribution charts
                         html.Div([
-                            html.H2("Normal Distributions", className="text-xl font-bold text-white mb-4"),
+                            html.H2("Basis Distributions", className="text-xl font-bold text-white mb-4"),
                             html.Div([
                                 # Short-term distributions
                                 html.Div([
@@ -379,7 +657,7 @@ def create_dashboard():
                                 
                                 # Long-term distributions
                                 html.Div([
-                                    html.H3("Long-term Distributions (180-720 days)", 
+                                    html.H3("Long-term Distributions (180-540 days)", 
                                           className="text-lg font-bold text-white mb-2"),
                                     dcc.Graph(id='long-term-dist', className="h-64")
                                 ], className="flex-1"),
@@ -400,55 +678,178 @@ def create_dashboard():
         
     ], className="flex-1 overflow-y-auto")
 
-# Updated callbacks
-@callback(
+# Hit rates reported on /metrics when instrumentation is enabled
+register_cache('figures', lambda: figure_cache.stats(), shared=True)
+register_cache('bond_series', lru_stats(get_bond_series))
+register_cache('bond_distributions', lru_stats(get_bond_distributions))
+register_cache('table_rows', lru_stats(create_table_row))
+
+# Bond selection is pure UI state, so it runs in the browser (clientside.js)
+clientside_callback(
+    ClientsideFunction(namespace="basis", function_name="select_bond"),
     Output("chart-container", "style"),
     Output("chart-title", "children"),
+    Output("selected-bond", "data"),
+    Output({"type": "bond-name", "bond": ALL}, "className"),
+    Input({"type": "bond-name", "bond": ALL}, "n_clicks"),
+    State("selected-bond", "data"),
+    prevent_initial_call=True
+)
+
+# Figures are built in a background job, which a new selection cancels; the
+# job fills the shared figure cache, so its work outlives it
+@callback(
     Output("basis-chart", "figure"),
     Output("short-term-dist", "figure"),
     Output("long-term-dist", "figure"),
-    Output("selected-bond", "data"),
-    Output('first-row-tables', 'children'),
-    Output('second-row-tables', 'children'),
-    Input({"type": "bond-name", "bond": ALL}, "n_clicks"),
-    State({"type": "bond-name", "bond": ALL}, "children"),
+    Input("selected-bond", "data"),
+    background=True,
+    manager=background_manager,
+    cancel=[Input("selected-bond", "data")],
+    running=[
+        (Output("chart-progress-container", "style"), {'display': 'block'}, {'display': 'none'}),
+    ],
+    progress=[Output("chart-progress", "value"), Output("chart-progress", "max")],
+    progress_default=["0", "2"],
+    prevent_initial_call=True
+)
+@instrumented('update_chart')
+def update_chart(set_progress, bond_name):
+    if not bond_name:
+        raise PreventUpdate
+    # Table bonds can be missing from the history store
+    if bond_name not in history_store:
+        empty = create_empty_chart(f"No history for {bond_name}")
+        return empty, empty, empty
+    
+    def build(create):
+        with stage('figure'):
+            return create(bond_name)
+    
+    # Report each finished figure
+    set_progress(("0", "2"))
+    main_fig = figure_cache.get_or_build(
+        bond_name, ('basis', BASIS_WINDOW, BASIS_RENDER_MODE, MAX_CHART_POINTS),
+        lambda: build(create_basis_chart))
+    set_progress(("1", "2"))
+    short_term_fig, long_term_fig = figure_cache.get_or_build(
+        bond_name, ('distributions',),
+        lambda: build(create_distribution_charts))
+    
+    return main_fig, short_term_fig, long_term_fig
+
+def get_relayout_window(relayout_data):
+    """Returns the (start, end) dates of a zoom, (None, None) for a reset, or None"""
+    if relayout_data.get("xaxis.autorange"):
+        return None, None
+    if "xaxis.range[0]" in relayout_data:
+        bounds = relayout_data["xaxis.range[0]"], relayout_data["xaxis.range[1]"]
+    elif "xaxis.range" in relayout_data:
+        bounds = relayout_data["xaxis.range"]
+    else:
+        return None
+    # Plotly sends range ends as 'YYYY-MM-DD[ HH:MM:SS.fff]' strings
+    return tuple(np.datetime64(str(bound)[:10], 'D') for bound in bounds)
+
+@callback(
+    Output("basis-chart", "figure", allow_duplicate=True),
+    Input("basis-chart", "relayoutData"),
     State("selected-bond", "data"),
     prevent_initial_call=True
 )
-def update_chart(n_clicks, bond_names, current_selected):
-    if not any(n_clicks):
+@instrumented('update_basis_zoom')
+def update_basis_zoom(relayout_data, bond_name):
+    # SVG charts already hold every point
+    if (not bond_name or not relayout_data or BASIS_RENDER_MODE != 'webgl'
+            or bond_name not in history_store):
+        raise PreventUpdate
+    window = get_relayout_window(relayout_data)
+    if window is None:
         raise PreventUpdate
-        
-    # Find which bond was clicked
-    clicked_idx = next(i for i, clicks in enumerate(n_clicks) if clicks)
-    bond_name = bond_names[clicked_idx]
     
-    # Create all charts
-    main_fig = create_basis_chart(bond_name)
-    short_term_fig, long_term_fig = create_distribution_charts(bond_name)
+    # Swap in the zoomed window's points, leaving layout and styling untouched
+    patch = Patch()
+    for i, (x, y) in enumerate(get_basis_trace_data(bond_name, *window)):
+        patch["data"][i]["x"] = x
+        patch["data"][i]["y"] = y
+    return patch
+
+@callback(
+    Output("first-row-tables", "children"),
+    Output("second-row-tables", "children"),
+    Output("bond-search", "value"),
+    Output("sector-filter", "value"),
+    Output("rating-filter", "value"),
+    Output("basis-threshold", "value"),
+    Output("zscore-threshold", "value"),
+    Input("apply-filters", "n_clicks"),
+    Input("reset-filters", "n_clicks"),
+    Input("bond-search", "value"),
+    State("sector-filter", "value"),
+    State("rating-filter", "value"),
+    State("basis-threshold", "value"),
+    State("zscore-threshold", "value"),
+    State("selected-bond", "data"),
+    prevent_initial_call=True
+)
+@instrumented('apply_filters')
+def apply_filters(apply_clicks, reset_clicks, search, sector, rating, basis_threshold,
+                  zscore_threshold, selected_bond):
+    if ctx.triggered_id == "reset-filters":
+        with stage('tables'):
+            first_row, second_row = create_table_rows(get_all_country_data(), selected_bond)
+        return first_row, second_row, "", None, None, None, None
     
-    # Recreate tables with new selected bond
-    first_row = [
-        create_sovereign_basis_table("COLOM", colombia_data, bond_name),
-        create_sovereign_basis_table("BRAZIL", brazil_data, bond_name),
-        create_sovereign_basis_table("MEXICO", mexico_data, bond_name),
-        create_sovereign_basis_table("CHILE", chile_data, bond_name),
-    ]
+    # Only the matching bonds' rows are sent back to the tables
+    with stage('filter'):
+        positions = get_bond_filter().matching(
+            search,
+            {'Sector': sector, 'Rating': rating},
+            {('Live',): basis_threshold, ZSCORE_COLUMNS: zscore_threshold})
+    with stage('tables'):
+        first_row, second_row = create_table_rows(basis_store.countries_at(positions), selected_bond)
+    return first_row, second_row, no_update, no_update, no_update, no_update, no_update
+
+@callback(
+    Output({"type": "live-cell", "bond": ALL}, "children"),
+    Output({"type": "cod-cell", "bond": ALL}, "children"),
+    Output({"type": "cod-cell", "bond": ALL}, "className"),
+    Output("live-seq", "data"),
+    Input("live-interval", "n_intervals"),
+    State("live-seq", "data"),
+    prevent_initial_call=True
+)
+def update_live_cells(n_intervals, cursor):
+    # Cursors are [dataset, epoch, seq]; a new snapshot refreshes every cell
+    dataset = figure_cache.dataset
+    _, seq = sync_ticks()
+    known = cursor[1:] if cursor and cursor[0] == dataset else None
+    log_cursor, changed = tick_log.changed_since(known, seq)
+    new_cursor = [dataset, *log_cursor]
+    if new_cursor == cursor:
+        raise PreventUpdate
     
-    second_row = [
-        create_sovereign_basis_table("PERU", peru_data, bond_name),
-        create_sovereign_basis_table("PANAMA", panama_data, bond_name),
-        create_sovereign_basis_table("DOMREP", domrep_data, bond_name),
-        html.Div(className="bg-transparent")
-    ]
+    # Coalesce every tick since the last refresh into the bonds' current values
+    if changed is None:
+        rows = slice(None)
+    else:
+        rows = basis_store.positions(changed)
+        rows = rows[rows >= 0]
+    updates = dict(zip(basis_store.bonds[rows].tolist(),
+                       zip(basis_store.column('Live')[rows].tolist(),
+                           basis_store.column('CoD')[rows].tolist())))
     
-    return (
-        {'display': 'block'},
-        f"Historical Basis Evolution - {bond_name}",
-        main_fig,
-        short_term_fig,
-        long_term_fig,
-        bond_name,
-        first_row,
-        second_row
-    )
+    # Only send the cells of bonds that ticked
+    live_cells, cod_cells, cod_classes = [], [], []
+    for output in ctx.outputs_list[0]:
+        values = updates.get(output["id"]["bond"])
+        if values is None:
+            live_cells.append(no_update)
+            cod_cells.append(no_update)
+            cod_classes.append(no_update)
+        else:
+            live_cells.append(f"{values[0]}")
+            cod_cells.append(f"{values[1]:+d}")
+            cod_classes.append(get_cod_cell_class(values[1]))
+    
+    return live_cells, cod_cells, cod_classes, new_cursor
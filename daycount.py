@@ -0,0 +1,129 @@
+"""Vectorized day counts and business-day rolls on datetime64 arrays.
+
+Every function broadcasts its date arguments like numpy arithmetic, so a
+bond x valuation-date grid of year fractions is a single call:
+
+    time_to_maturity(maturities, valuation_dates)   # dates x bonds
+"""
+import numpy as np
+
+ACT_365F = 'ACT/365F'
+ACT_360 = 'ACT/360'
+THIRTY_360 = '30/360'
+ACT_ACT = 'ACT/ACT'
+CONVENTIONS = (ACT_365F, ACT_360, THIRTY_360, ACT_ACT)
+
+ROLLS = ('following', 'preceding', 'modified_following', 'modified_preceding')
+
+
+def _days(dates):
+    return np.asarray(dates, dtype='datetime64[D]')
+
+
+def _ymd(dates):
+    """Year, month (1-12) and day of month of each date as int64 arrays"""
+    years = dates.astype('datetime64[Y]')
+    months = dates.astype('datetime64[M]')
+    day = (dates - months).astype(np.int64) + 1
+    month = (months - years).astype(np.int64) + 1
+    return years.astype(np.int64) + 1970, month, day
+
+
+def _days_in_year(dates):
+    years = dates.astype('datetime64[Y]')
+    return (years + 1).astype('datetime64[D]') - years.astype('datetime64[D]')
+
+
+def _thirty_360(start, end):
+    """30/360 bond basis: a 31st counts as the 30th, the end only if the start is a 30th or 31st"""
+    y1, m1, d1 = _ymd(start)
+    y2, m2, d2 = _ymd(end)
+    d1 = np.minimum(d1, 30)
+    d2 = np.where(d1 == 30, np.minimum(d2, 30), d2)
+    return (360 * (y2 - y1) + 30 * (m2 - m1) + (d2 - d1)) / 360
+
+
+def _act_act(start, end):
+    """Act/Act ISDA: days in leap years over 366, other days over 365"""
+    def elapsed(dates):
+        # Whole years since 1970 plus the fraction of the current year
+        year_start = dates.astype('datetime64[Y]')
+        days = (dates - year_start.astype('datetime64[D]')).astype(np.float64)
+        return year_start.astype(np.int64) + days / _days_in_year(dates).astype(np.float64)
+    return elapsed(end) - elapsed(start)
+
+
+def year_fraction(start, end, convention=ACT_365F):
+    """Years from `start` to `end` under a day-count convention; negative if end is earlier"""
+    start, end = _days(start), _days(end)
+    if convention == ACT_365F:
+        return (end - start).astype(np.float64) / 365
+    if convention == ACT_360:
+        return (end - start).astype(np.float64) / 360
+    if convention == THIRTY_360:
+        return _thirty_360(start, end)
+    if convention == ACT_ACT:
+        return _act_act(start, end)
+    raise ValueError(f"Unknown day count convention {convention!r}; expected one of {CONVENTIONS}")
+
+
+def time_to_maturity(maturities, valuation_dates, convention=ACT_365F, calendar=None):
+    """Years to maturity of each bond at each valuation date.
+
+    With a 1-D array of valuation dates the result is valuation dates x
+    bonds; a single valuation date gives one value per bond. Maturities
+    falling on a holiday are rolled modified-following when a calendar
+    is given.
+    """
+    maturities = _days(maturities)
+    if calendar is not None:
+        maturities = calendar.roll(maturities, 'modified_following')
+    valuation_dates = _days(valuation_dates)
+    if valuation_dates.ndim:
+        return year_fraction(valuation_dates[:, None], maturities[None, :], convention)
+    return year_fraction(valuation_dates, maturities, convention)
+
+
+class BusinessCalendar:
+    """Business days of a market: a weekmask plus a sorted holiday array.
+
+    The holidays are sorted and deduplicated once into a numpy
+    busdaycalendar, so rolls and offsets over whole arrays run in C.
+    """
+
+    def __init__(self, holidays=(), weekmask='1111100'):
+        self._calendar = np.busdaycalendar(weekmask=weekmask, holidays=_days(holidays))
+
+    @property
+    def holidays(self):
+        return self._calendar.holidays
+
+    def is_business_day(self, dates):
+        return np.is_busday(_days(dates), busdaycal=self._calendar)
+
+    def roll(self, dates, convention='following'):
+        """Moves dates that are not business days to one that is.
+
+        The modified rolls stay within the month, rolling the other way
+        when the first choice would cross into another one.
+        """
+        if convention not in ROLLS:
+            raise ValueError(f"Unknown roll {convention!r}; expected one of {ROLLS}")
+        dates = _days(dates)
+        modified = convention.startswith('modified_')
+        roll = convention.removeprefix('modified_')
+        rolled = np.busday_offset(dates, 0, roll=roll, busdaycal=self._calendar)
+        if not modified:
+            return rolled
+        other = 'preceding' if roll == 'following' else 'following'
+        crossed = rolled.astype('datetime64[M]') != dates.astype('datetime64[M]')
+        return np.where(crossed, np.busday_offset(dates, 0, roll=other, busdaycal=self._calendar),
+                        rolled)
+
+    def add_business_days(self, dates, days, roll='following'):
+        """Offsets dates by a number of business days, rolling non-business starts first"""
+        return np.busday_offset(_days(dates), days, roll=roll, busdaycal=self._calendar)
+
+    def business_days_between(self, start, end):
+        """Business days in [start, end)"""
+        return np.busday_count(_days(start), _days(end), busdaycal=self._calendar)
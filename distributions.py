@@ -0,0 +1,117 @@
+import warnings
+
+import numpy as np
+
+# Horizons (in calendar days) behind the short- and long-term distribution charts
+SHORT_HORIZONS = (30, 60, 90)
+LONG_HORIZONS = (180, 360, 540)
+
+# Points per horizon in the density grid
+GRID_SIZE = 256
+
+
+def horizon_ends(dates, horizons):
+    """Row of the first observation at least each horizon (calendar days) after every date.
+
+    Returns a (horizons, n) array; rows past the end of the history are n.
+    """
+    dates = np.asarray(dates, dtype='datetime64[D]')
+    targets = dates[None, :] + np.asarray(horizons, dtype='timedelta64[D]')[:, None]
+    return np.searchsorted(dates, targets)
+
+
+def horizon_changes(values, horizons, dates=None):
+    """Basis changes over each horizon as a NaN-padded (horizons, n) array.
+
+    With `dates`, horizons are calendar days, so business-day histories
+    span the same time as their labels; without, they count observations.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    if dates is None:
+        end = np.arange(n)[None, :] + np.asarray(horizons)[:, None]
+    else:
+        end = horizon_ends(dates, horizons)
+    with np.errstate(invalid='ignore'):
+        changes = values[np.minimum(end, n - 1)] - values[None, :]
+    return np.where(end < n, changes, np.nan)
+
+
+def silverman_bandwidth(samples):
+    """Silverman's rule-of-thumb bandwidth for each row of `samples`"""
+    count = np.isfinite(samples).sum(axis=1)
+    with warnings.catch_warnings():
+        # All-NaN rows (horizons longer than the history) are expected
+        warnings.simplefilter('ignore', RuntimeWarning)
+        std = np.nanstd(samples, axis=1)
+        q75, q25 = np.nanpercentile(samples, [75, 25], axis=1)
+    spread = np.minimum(std, (q75 - q25) / 1.34)
+    spread = np.where(spread > 0, spread, std)
+    with np.errstate(divide='ignore'):
+        return 0.9 * spread * count.astype(np.float64) ** -0.2
+
+
+def binned_kde(samples, grid_size=GRID_SIZE, cut=3.0):
+    """Gaussian KDE of every row of `samples` in one vectorized call.
+
+    Each row gets its own regular grid spanning its data plus `cut`
+    bandwidths. Samples are linearly binned onto the grids and smoothed
+    with an FFT convolution, so the cost is O(n + grid log grid) per row.
+    NaNs are ignored. Returns (grids, densities), both (rows, grid_size).
+    """
+    samples = np.asarray(samples, dtype=np.float64)
+    rows = len(samples)
+    finite = np.isfinite(samples)
+    count = finite.sum(axis=1)
+
+    with warnings.catch_warnings():
+        # All-NaN rows (horizons longer than the history) are expected
+        warnings.simplefilter('ignore', RuntimeWarning)
+        low = np.nanmin(samples, axis=1)
+        high = np.nanmax(samples, axis=1)
+    bandwidth = silverman_bandwidth(samples)
+    bandwidth = np.where(bandwidth > 0, bandwidth, 1.0)
+    low = low - cut * bandwidth
+    high = high + cut * bandwidth
+    step = (high - low) / (grid_size - 1)
+    grids = low[:, None] + step[:, None] * np.arange(grid_size)
+
+    # Linear binning: split each sample between its two neighbouring grid points
+    position = np.where(finite, (samples - low[:, None]) / step[:, None], 0.0)
+    left = np.clip(np.floor(position).astype(np.int64), 0, grid_size - 2)
+    frac = position - left
+    offset = (np.arange(rows) * grid_size)[:, None]
+    weight = finite.astype(np.float64)
+    binned = (
+        np.bincount((offset + left).ravel(), (weight * (1 - frac)).ravel(),
+                    minlength=rows * grid_size)
+        + np.bincount((offset + left + 1).ravel(), (weight * frac).ravel(),
+                      minlength=rows * grid_size)
+    ).reshape(rows, grid_size)
+
+    # Gaussian kernel sampled at every grid offset, zero-padded against wrap-around
+    size = 2 * grid_size
+    lags = np.fft.fftfreq(size, 1.0 / size)
+    scaled = lags[None, :] * (step / bandwidth)[:, None]
+    kernel = np.exp(-0.5 * scaled * scaled) / (bandwidth[:, None] * np.sqrt(2 * np.pi))
+    smoothed = np.fft.irfft(np.fft.rfft(binned, size) * np.fft.rfft(kernel, size), size)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        densities = np.maximum(smoothed[:, :grid_size], 0.0) / count[:, None]
+    densities[count < 2] = np.nan
+    return grids, densities
+
+
+def basis_distributions(values, horizons=SHORT_HORIZONS + LONG_HORIZONS,
+                        grid_size=GRID_SIZE, dates=None):
+    """Densities of the basis level after each horizon, from historical changes.
+
+    Returns (current, grids, densities), where each row of `grids` is the
+    current basis plus the historical changes over that horizon. Pass the
+    history's `dates` to read the horizons as calendar days.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    finite = values[np.isfinite(values)]
+    current = finite[-1] if len(finite) else np.nan
+    grids, densities = binned_kde(horizon_changes(values, horizons, dates), grid_size)
+    return current, current + grids, densities
@@ -0,0 +1,98 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from instrumentation import stage
+
+
+class FigureCache:
+    """Bounded LRU cache of serialized figure JSON and computed analytics.
+
+    Entries are keyed by (bond, dataset, data version, params), where
+    `dataset` identifies the data they are built from. Bumping a bond's
+    version with `invalidate` makes its existing entries unreachable and
+    drops them, so figures are rebuilt once the bond's history changes.
+    """
+
+    def __init__(self, maxsize=128, ttl=None, dataset=None):
+        self.maxsize = maxsize
+        self.dataset = dataset
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._versions = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def version(self, bond):
+        return self._versions.get(bond, 0)
+
+    def _lookup(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (self.ttl is None or now - entry[0] < self.ttl):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return None
+
+    def _store(self, key, value):
+        with self._lock:
+            if key[1:4] == (self.dataset, self._generation, self.version(key[0])):
+                self._entries[key] = (time.monotonic(), value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+
+    def get_or_build(self, bond, params, build):
+        """Returns the cached figures for a key, building them on a miss.
+
+        `build` returns a figure or a tuple of figures; hits return the
+        same shape as plain figure dicts.
+        """
+        key = (bond, self.dataset, self._generation, self.version(bond), ('figures', params))
+        payload = self._lookup(key)
+        if payload is not None:
+            is_tuple, figure_json = payload
+            with stage('serialize'):
+                figures = [json.loads(fig_json) for fig_json in figure_json]
+            return tuple(figures) if is_tuple else figures[0]
+
+        result = build()
+        is_tuple = isinstance(result, tuple)
+        figures = result if is_tuple else (result,)
+        with stage('serialize'):
+            payload = (is_tuple, tuple(fig.to_json() for fig in figures))
+        self._store(key, payload)
+        return result
+
+    def get_or_compute(self, bond, params, compute):
+        """Returns a cached value (arrays, frames) for a key, computing it on a miss"""
+        key = (bond, self.dataset, self._generation, self.version(bond), ('values', params))
+        value = self._lookup(key)
+        if value is None:
+            value = compute()
+            self._store(key, value)
+        return value
+
+    def invalidate(self, bond=None):
+        """Drops cached figures for one bond, or for every bond"""
+        with self._lock:
+            if bond is None:
+                self._generation += 1
+                self._entries.clear()
+                return
+            self._versions[bond] = self.version(bond) + 1
+            for key in [key for key in self._entries if key[0] == bond]:
+                del self._entries[key]
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries)}
@@ -0,0 +1,135 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+from numpy.lib.format import open_memmap
+
+DATES_FILE = 'dates.npy'
+VALUES_FILE = 'values.npy'
+BONDS_FILE = 'bonds.json'
+META_FILE = 'meta.json'
+
+# Bonds per column block when scanning the whole matrix
+CHUNK_BONDS = 256
+
+
+class HistoryStore:
+    """Daily basis histories as a date x bond matrix.
+
+    The matrix is stored column-major, so one bond's history is a
+    contiguous, zero-copy column slice. Stores opened from disk keep the
+    matrix memory-mapped and only touch the pages of the bonds that are
+    read: `write` records the fingerprint and density of the matrix in
+    meta.json, so opening never scans it.
+    """
+
+    def __init__(self, dates, bonds, values, fingerprint=None, density=None):
+        dates = np.asarray(dates, dtype='datetime64[D]')
+        if values.shape != (len(dates), len(bonds)):
+            raise ValueError(
+                f"History shape {values.shape} does not match "
+                f"{len(dates)} dates x {len(bonds)} bonds")
+        self.dates = dates
+        self.bonds = list(bonds)
+        self.values = values
+        self._positions = {bond: i for i, bond in enumerate(self.bonds)}
+        self._fingerprint = fingerprint
+        self._density = density
+
+    @classmethod
+    def open(cls, path):
+        """Memory-maps a history directory written by `write`"""
+        dates = np.load(os.path.join(path, DATES_FILE))
+        values = np.load(os.path.join(path, VALUES_FILE), mmap_mode='r')
+        with open(os.path.join(path, BONDS_FILE)) as f:
+            bonds = json.load(f)
+        try:
+            with open(os.path.join(path, META_FILE)) as f:
+                meta = json.load(f)
+        except FileNotFoundError:
+            # Written before meta.json existed; both are computed on first use
+            meta = {}
+        return cls(dates, bonds, values, meta.get('fingerprint'), meta.get('density'))
+
+    @classmethod
+    def synthetic(cls, bonds, years=3, end=None, seed=42):
+        """Random-walk histories over business days, for demos and tests"""
+        end = np.datetime64(end or 'today', 'D')
+        start = end - np.timedelta64(int(years * 365), 'D')
+        dates = np.arange(start, end + 1, dtype='datetime64[D]')
+        dates = dates[np.is_busday(dates)]
+
+        rng = np.random.default_rng(seed)
+        steps = rng.normal(0, 0.6, (len(dates), len(bonds)))
+        levels = rng.uniform(5, 20, len(bonds))
+        values = np.asfortranarray(levels + np.cumsum(steps, axis=0))
+        return cls(dates, bonds, values)
+
+    def __len__(self):
+        return len(self.bonds)
+
+    def __contains__(self, bond):
+        return bond in self._positions
+
+    def position(self, bond):
+        return self._positions[bond]
+
+    def _scan(self):
+        """Hashes and counts the nonzeros of the matrix, one column block at a time.
+
+        Yields each block's column slice and values, so `write` copies the
+        matrix in the same pass.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(self.dates.tobytes())
+        digest.update(json.dumps(self.bonds).encode())
+        nonzero = 0
+        for start in range(0, len(self.bonds), CHUNK_BONDS):
+            columns = slice(start, start + CHUNK_BONDS)
+            block = np.asarray(self.values[:, columns])
+            # Column blocks of a column-major matrix are hashed without copying
+            digest.update(np.ascontiguousarray(block.T))
+            nonzero += np.count_nonzero(block)
+            yield columns, block
+        self._fingerprint = digest.hexdigest()
+        self._density = nonzero / max(self.values.size, 1)
+
+    def fingerprint(self):
+        """Hash of the dates, bonds and values, identifying the data in cache keys"""
+        if self._fingerprint is None:
+            for _ in self._scan():
+                pass
+        return self._fingerprint
+
+    def density(self):
+        """Share of nonzero cells in the matrix"""
+        if self._density is None:
+            for _ in self._scan():
+                pass
+        return self._density
+
+    def history(self, bond):
+        """Returns (dates, values) for one bond as views into the store"""
+        return self.dates, self.values[:, self._positions[bond]]
+
+    def write(self, path):
+        """Writes the store in the memory-mappable on-disk layout"""
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, DATES_FILE), self.dates)
+        out = open_memmap(os.path.join(path, VALUES_FILE), mode='w+',
+                          dtype=self.values.dtype, shape=self.values.shape,
+                          fortran_order=True)
+        for columns, block in self._scan():
+            out[:, columns] = block
+        out.flush()
+        del out
+        with open(os.path.join(path, BONDS_FILE), 'w') as f:
+            json.dump(self.bonds, f)
+        write_meta(path, self._fingerprint, self._density)
+
+
+def write_meta(path, fingerprint, density):
+    """Records the identity and density of a history directory's matrix"""
+    with open(os.path.join(path, META_FILE), 'w') as f:
+        json.dump({'fingerprint': fingerprint, 'density': density}, f)
@@ -0,0 +1,265 @@
+"""Opt-in latency instrumentation for the dashboard callbacks.
+
+Set BASIS_INSTRUMENTATION=1 to record per-stage timings of the instrumented
+callbacks, callback response sizes and cache hit rates, and to serve them
+in Prometheus text format on /metrics. Observations are counted in a small
+diskcache store (BASIS_METRICS_DIR), so background chart jobs and every
+gunicorn worker add to the same series.
+
+Loading the page with ?profile=1 sets a cookie that runs each instrumented
+callback of that browser under cProfile (?profile=0 clears it); the stats
+are dumped to BASIS_PROFILE_DIR. A callback request can also carry
+?profile=1 itself.
+
+When disabled, `instrumented` returns the callback unchanged and `stage`
+returns a shared no-op context manager.
+"""
+import contextlib
+import contextvars
+import os
+import tempfile
+import threading
+import time
+from functools import wraps
+
+ENABLED = os.environ.get("BASIS_INSTRUMENTATION", "").lower() not in ("", "0", "false", "no")
+METRICS_DIR = os.environ.get("BASIS_METRICS_DIR",
+                             os.path.join(tempfile.gettempdir(), "basis-metrics"))
+PROFILE_DIR = os.environ.get("BASIS_PROFILE_DIR",
+                             os.path.join(tempfile.gettempdir(), "basis-profiles"))
+PROFILE_FLAG = "profile"
+PROFILE_COOKIE = "basis_profile"
+
+# Upper bounds of the histogram buckets
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BYTES_BUCKETS = (1 << 10, 1 << 13, 1 << 16, 1 << 18, 1 << 20, 1 << 22, 1 << 24)
+
+# Histograms store integer microseconds or bytes so diskcache can add atomically
+_SCALES = {'seconds': 1_000_000, 'bytes': 1}
+_BUCKETS = {'seconds': LATENCY_BUCKETS, 'bytes': BYTES_BUCKETS}
+
+_NULL = contextlib.nullcontext()
+_callback_name = contextvars.ContextVar('callback_name', default='')
+_caches = {}
+_flushed = {}
+_flush_lock = threading.Lock()
+_store = None
+
+
+def _reset_after_fork():
+    # A chart job can be forked while another thread holds the flush lock
+    global _flush_lock
+    _flush_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _metrics_store():
+    global _store
+    if _store is None:
+        import diskcache
+        _store = diskcache.Cache(METRICS_DIR)
+    return _store
+
+
+def observe(metric, labels, value, buckets=LATENCY_BUCKETS, unit='seconds'):
+    """Adds one observation to a histogram shared by every process"""
+    scale = _SCALES[unit]
+    labels = tuple(sorted(labels.items()))
+    bound = next((b for b in buckets if value <= b), float('inf'))
+    store = _metrics_store()
+    store.incr(('count', metric, unit, labels))
+    store.incr(('sum', metric, unit, labels), int(round(value * scale)))
+    store.incr(('bucket', metric, unit, labels, bound))
+
+
+def _record_stage(name, started):
+    observe('basis_callback_stage_seconds', {'callback': _callback_name.get(), 'stage': name},
+            time.perf_counter() - started)
+
+
+@contextlib.contextmanager
+def _timed_stage(name):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record_stage(name, started)
+
+
+def stage(name):
+    """Times a block as one stage of the running callback"""
+    return _timed_stage(name) if ENABLED else _NULL
+
+
+def register_cache(name, stats, shared=False):
+    """Adds a cache to /metrics; `stats` returns a dict with 'hits' and 'misses'.
+
+    The counts of process-local caches are added to the metrics store
+    after every instrumented callback, so /metrics sums all workers.
+    `shared` caches already count across processes and are read as is.
+    """
+    _caches[name] = (stats, shared)
+
+
+def flush_cache_counts():
+    """Adds this process's cache hits and misses since the last flush to the store"""
+    store = _metrics_store()
+    with _flush_lock:
+        for name, (stats, shared) in _caches.items():
+            if shared:
+                continue
+            counts = stats()
+            last = _flushed.get(name, {})
+            for field in ('hits', 'misses'):
+                # Cleared lru caches count again from zero
+                delta = counts[field] - last.get(field, 0)
+                delta = counts[field] if delta < 0 else delta
+                if delta:
+                    store.incr(('cache', name, field), delta)
+            _flushed[name] = counts
+
+
+def lru_stats(cached):
+    """Stats function for a functools.lru_cache wrapped function"""
+    def stats():
+        info = cached.cache_info()
+        return {'hits': info.hits, 'misses': info.misses}
+    return stats
+
+
+def _profile_requested():
+    from dash import ctx
+    try:
+        return (ctx.args.get(PROFILE_FLAG) == '1'
+                or ctx.cookies.get(PROFILE_COOKIE) == '1')
+    except Exception:
+        return False
+
+
+def _profiled(name, func, args, kwargs):
+    """Runs a callback under cProfile and dumps the stats for that run"""
+    import cProfile
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(func, *args, **kwargs)
+    finally:
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        path = os.path.join(PROFILE_DIR, f"{name}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.prof")
+        profiler.dump_stats(path)
+
+
+def instrumented(name):
+    """Decorator timing a callback's total run and giving its stages a label"""
+    def decorate(func):
+        if not ENABLED:
+            return func
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            token = _callback_name.set(name)
+            started = time.perf_counter()
+            try:
+                if _profile_requested():
+                    return _profiled(name, func, args, kwargs)
+                return func(*args, **kwargs)
+            finally:
+                _record_stage('total', started)
+                _callback_name.reset(token)
+                flush_cache_counts()
+        return wrapper
+    return decorate
+
+
+def _escape(value):
+    """Escapes a label value as the text exposition format requires"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels, **extra):
+    pairs = list(labels) + list(extra.items())
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in pairs) + '}'
+
+
+def render_metrics():
+    """Returns every metric in Prometheus text exposition format"""
+    store = _metrics_store()
+    flush_cache_counts()
+    series = {}
+    for key in store.iterkeys():
+        if key[0] == 'cache':
+            continue
+        kind, metric, unit, labels = key[:4]
+        entry = series.setdefault((metric, unit), {}).setdefault(labels, {'buckets': {}})
+        value = store.get(key, 0)
+        if kind == 'bucket':
+            entry['buckets'][key[4]] = value
+        else:
+            entry[kind] = value
+
+    lines = []
+    for (metric, unit), by_labels in sorted(series.items()):
+        scale = _SCALES[unit]
+        lines.append(f'# TYPE {metric} histogram')
+        for labels, entry in sorted(by_labels.items()):
+            # Every bound is listed, observed or not, so scrapes see a fixed bucket set
+            cumulative = 0
+            for bound in sorted({*_BUCKETS[unit], *entry['buckets'], float('inf')}):
+                cumulative += entry['buckets'].get(bound, 0)
+                le = '+Inf' if bound == float('inf') else f'{bound:.15g}'
+                lines.append(f'{metric}_bucket{_format_labels(labels, le=le)} {cumulative}')
+            lines.append(f'{metric}_sum{_format_labels(labels)} {entry.get("sum", 0) / scale:.15g}')
+            lines.append(f'{metric}_count{_format_labels(labels)} {entry.get("count", 0)}')
+
+    lines.append('# TYPE basis_cache_hits_total counter')
+    lines.append('# TYPE basis_cache_misses_total counter')
+    lines.append('# TYPE basis_cache_hit_ratio gauge')
+    for name, (stats, shared) in sorted(_caches.items()):
+        counts = stats() if shared else {field: store.get(('cache', name, field), 0)
+                                         for field in ('hits', 'misses')}
+        labels = (('cache', name),)
+        total = counts['hits'] + counts['misses']
+        lines.append(f'basis_cache_hits_total{_format_labels(labels)} {counts["hits"]}')
+        lines.append(f'basis_cache_misses_total{_format_labels(labels)} {counts["misses"]}')
+        lines.append(f'basis_cache_hit_ratio{_format_labels(labels)} {counts["hits"] / total if total else 0:g}')
+    return '\n'.join(lines) + '\n'
+
+
+def _register_server_hooks():
+    """Adds /metrics and the response-size and profiling hooks to the Dash app"""
+    from dash import hooks
+
+    @hooks.route('metrics')
+    def metrics():
+        from flask import Response
+        return Response(render_metrics(), mimetype='text/plain; version=0.0.4')
+
+    @hooks.setup()
+    def setup(app):
+        from flask import request
+
+        @app.server.before_request
+        def start_timer():
+            request.environ['basis.started'] = time.perf_counter()
+
+        @app.server.after_request
+        def record_response(response):
+            if request.path.endswith('_dash-update-component') and not response.is_streamed:
+                body = request.get_json(silent=True) or {}
+                labels = {'output': body.get('output', '')[:120]}
+                observe('basis_callback_response_bytes', labels,
+                        response.calculate_content_length() or 0, BYTES_BUCKETS, 'bytes')
+                observe('basis_callback_request_seconds', labels,
+                        time.perf_counter() - request.environ.get('basis.started', time.perf_counter()))
+            # ?profile=1 on the page turns profiling on for this browser, ?profile=0 off
+            flag = request.args.get(PROFILE_FLAG)
+            if flag in ('0', '1') and not request.path.endswith('_dash-update-component'):
+                response.set_cookie(PROFILE_COOKIE, flag, httponly=True, samesite='Lax')
+            return response
+
+
+if ENABLED:
+    _register_server_hooks()
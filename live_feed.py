@@ -0,0 +1,149 @@
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+
+import diskcache
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class TickLog:
+    """Sequenced log of bond ticks, shared by every worker process on a host.
+
+    Each batch of ticks is appended to a diskcache store under the next
+    sequence number, as the bonds' names with their new Live and CoD
+    values; only the last `capacity` batches are kept. Every worker applies
+    the batches it has not seen yet to its own BasisStore, and answers a
+    browser's [epoch, seq] cursor from the log, so any worker can tell any
+    browser which bonds changed since its last refresh. Checkpoints of
+    every bond's values let a worker that fell further behind catch up.
+
+    The epoch is created with the log and replaced by `reset`; a cursor
+    from another epoch, ahead of the log or older than its batches is
+    answered with a full refresh.
+    """
+
+    def __init__(self, directory, capacity=4096, memo=256):
+        self.capacity = capacity
+        self._store = diskcache.Cache(directory)
+        self._store.add('epoch', uuid.uuid4().hex)
+        # Decoded batches are immutable, so recent ones are kept in process
+        self._memo = OrderedDict()
+        self._memo_size = memo
+
+    @property
+    def epoch(self):
+        return self._store.get('epoch')
+
+    @property
+    def seq(self):
+        return self._store.get('seq', 0)
+
+    def append(self, bonds, live, cod):
+        """Logs a batch of ticks and returns its sequence number"""
+        batch = (np.asarray(bonds), np.asarray(live), np.asarray(cod))
+        with self._store.transact():
+            seq = self._store.incr('seq')
+            self._store.set(('batch', seq), batch)
+            self._store.delete(('batch', seq - self.capacity))
+        return seq
+
+    def checkpoint(self, seq, bonds, live, cod):
+        """Records every bond's values as of batch `seq`"""
+        self._store.set('checkpoint', (seq, np.asarray(bonds), np.asarray(live), np.asarray(cod)))
+
+    def latest_checkpoint(self):
+        """Returns (seq, bonds, live, cod) of the last checkpoint, or None"""
+        return self._store.get('checkpoint')
+
+    def reset(self):
+        """Drops every batch and checkpoint and starts a new epoch"""
+        with self._store.transact():
+            self._store.clear()
+            self._store.set('epoch', uuid.uuid4().hex)
+
+    def claim(self, owner, ttl=5.0):
+        """Makes `owner` the only producer for `ttl` seconds; True while it holds the claim"""
+        with self._store.transact():
+            if self._store.get('producer') not in (None, owner):
+                return False
+            self._store.set('producer', owner, expire=ttl)
+            return True
+
+    def _batch(self, epoch, seq):
+        key = (epoch, seq)
+        if key in self._memo:
+            return self._memo[key]
+        batch = self._store.get(('batch', seq))
+        if batch is not None:
+            self._memo[key] = batch
+            if len(self._memo) > self._memo_size:
+                self._memo.popitem(last=False)
+        return batch
+
+    def read(self, after, until):
+        """Returns the batches after `after` up to `until`, or None if some are gone"""
+        epoch = self.epoch
+        batches = []
+        for seq in range(after + 1, until + 1):
+            batch = self._batch(epoch, seq)
+            if batch is None:
+                return None
+            batches.append(batch)
+        return batches
+
+    def changed_since(self, cursor, until):
+        """Returns (cursor, bonds) of the bonds that ticked after `cursor` up to `until`.
+
+        `bonds` is None when the cursor is None, from another epoch, ahead
+        of `until`, or older than the kept batches; the caller should then
+        refresh everything.
+        """
+        epoch = self.epoch
+        new_cursor = [epoch, until]
+        if cursor is None or cursor[0] != epoch or not 0 <= until - cursor[1] <= self.capacity:
+            return new_cursor, None
+        batches = self.read(cursor[1], until)
+        if batches is None:
+            return new_cursor, None
+        if not batches:
+            return new_cursor, np.empty(0, dtype=object)
+        return new_cursor, np.unique(np.concatenate([bonds for bonds, _, _ in batches]))
+
+
+class SimulatedFeed(threading.Thread):
+    """Background producer of random Live moves, for demos and tests.
+
+    Every `1 / batches_per_sec` seconds it moves a random batch of bonds by
+    one basis point each and hands (bonds, moves) to `publish`. Assign
+    `bonds` to re-point it at another universe.
+    """
+
+    def __init__(self, publish, bonds, rate=1000, batches_per_sec=20, seed=None):
+        super().__init__(daemon=True)
+        self.publish = publish
+        self.bonds = np.asarray(bonds)
+        self.rate = rate
+        self.batches_per_sec = batches_per_sec
+        self._rng = np.random.default_rng(seed)
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def run(self):
+        batch = max(1, self.rate // self.batches_per_sec)
+        interval = 1.0 / self.batches_per_sec
+        while not self._stop_event.wait(interval):
+            bonds = self.bonds
+            picks = self._rng.integers(0, len(bonds), batch)
+            positions, inverse = np.unique(picks, return_inverse=True)
+            moves = np.zeros(len(positions), dtype=np.int64)
+            np.add.at(moves, inverse, self._rng.choice([-1, 1], batch))
+            try:
+                self.publish(bonds[positions], moves)
+            except Exception:
+                # Keep producing; the failed batch is dropped
+                logger.exception("Could not publish simulated ticks")
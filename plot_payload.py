@@ -0,0 +1,74 @@
+import base64
+import json
+
+import numpy as np
+
+# Points sent per trace; roughly two per horizontal pixel of the basis chart
+MAX_CHART_POINTS = 2000
+
+_MS_PER_DAY = 86_400_000
+
+
+def minmax_indices(y, max_points=MAX_CHART_POINTS):
+    """Indices keeping the min and max of each bucket, in order.
+
+    Splits the series into max_points / 2 equal buckets, so spikes survive
+    decimation. Fully vectorized; returns all indices for short series.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    buckets = max(max_points // 2, 1)
+    if n <= max_points:
+        return np.arange(n)
+
+    size = -(-n // buckets)
+    padded = np.full(buckets * size, np.nan)
+    padded[:n] = y
+    blocks = padded.reshape(buckets, size)
+    filled = np.isfinite(blocks)
+    starts = np.arange(buckets) * size
+    lows = np.argmin(np.where(filled, blocks, np.inf), axis=1) + starts
+    highs = np.argmax(np.where(filled, blocks, -np.inf), axis=1) + starts
+    indices = np.unique(np.concatenate([lows, highs, [0, n - 1]]))
+    return indices[indices < n]
+
+
+def typed_array(values, dtype='f4'):
+    """Encodes an array as a plotly.js typed-array spec (base64 binary)"""
+    data = np.ascontiguousarray(values, dtype=dtype)
+    return {'dtype': data.dtype.str.lstrip('<|'), 'bdata': base64.b64encode(data.tobytes()).decode()}
+
+
+def date_axis_values(dates):
+    """Dates as float64 epoch milliseconds, which a date axis plots directly"""
+    days = np.asarray(dates, dtype='datetime64[D]').astype(np.int64)
+    return typed_array(days.astype(np.float64) * _MS_PER_DAY, 'f8')
+
+
+def payload_size(fig):
+    """Bytes the figure takes once serialized for the browser"""
+    from plotly.utils import PlotlyJSONEncoder
+
+    if hasattr(fig, 'to_plotly_json'):
+        fig = fig.to_plotly_json()
+    return len(json.dumps(fig, cls=PlotlyJSONEncoder))
+
+
+def main():
+    """Compares the basis chart payload in both render modes on a 20-year history"""
+    import time
+    import dashboard
+    from history_store import HistoryStore
+
+    bond = dashboard.basis_store.bonds[0]
+    dashboard.history_store = HistoryStore.synthetic([bond], years=20)
+    for mode in ('svg', 'webgl'):
+        started = time.perf_counter()
+        fig = dashboard.create_basis_chart(bond, render_mode=mode)
+        size = payload_size(fig)
+        elapsed = time.perf_counter() - started
+        print(f"{mode:>5}: {size / 1024:8.1f} KiB, built and serialized in {elapsed * 1000:.0f} ms")
+
+
+if __name__ == '__main__':
+    main()
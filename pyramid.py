@@ -0,0 +1,50 @@
+import numpy as np
+
+from plot_payload import minmax_indices
+
+# Calendar periods of the coarser pyramid levels, finest first
+LEVEL_PERIODS = ('W', 'M')
+
+
+def _period_extremes(dates, values, period):
+    """Indices of the minimum and maximum value within each calendar period"""
+    periods = dates.astype(f'datetime64[{period}]').astype(np.int64)
+    run_starts = np.flatnonzero(np.r_[True, periods[1:] != periods[:-1]])
+    lows = np.lexsort((values, periods))[run_starts]
+    highs = np.lexsort((-values, periods))[run_starts]
+    return np.unique(np.concatenate([lows, highs]))
+
+
+class HistoryPyramid:
+    """Multi-resolution index over one bond's daily history.
+
+    Level 0 is every day; the weekly and monthly levels keep the days of
+    each period's minimum and maximum basis, so spikes survive at every
+    resolution. Levels store row indices into the daily arrays, and
+    window queries binary-search the date index of each level.
+    """
+
+    def __init__(self, dates, values):
+        self.dates = np.asarray(dates, dtype='datetime64[D]')
+        values = np.asarray(values, dtype=np.float64)
+        self.levels = [np.arange(len(self.dates))]
+        self.levels += [_period_extremes(self.dates, values, period) for period in LEVEL_PERIODS]
+        self._level_dates = [self.dates[level] for level in self.levels]
+        self._values = values
+
+    def window(self, start=None, end=None, max_points=2000):
+        """Row indices covering [start, end] at the finest level that fits.
+
+        One extra point on each side keeps lines running to the edges of
+        the view. If even the coarsest level has too many points, it is
+        decimated further.
+        """
+        start = self.dates[0] if start is None else np.datetime64(start, 'D')
+        end = self.dates[-1] if end is None else np.datetime64(end, 'D')
+        for level, level_dates in zip(self.levels, self._level_dates):
+            lo = max(np.searchsorted(level_dates, start, 'left') - 1, 0)
+            hi = min(np.searchsorted(level_dates, end, 'right') + 1, len(level))
+            if hi - lo <= max_points:
+                return level[lo:hi]
+        rows = level[lo:hi]
+        return rows[minmax_indices(self._values[rows], max_points)]
@@ -0,0 +1,104 @@
+import numpy as np
+
+# Trading-day windows behind the Z3m, Z6m and Z12m columns
+HORIZON_WINDOWS = {'Z3m': 63, 'Z6m': 126, 'Z12m': 252}
+
+
+def _cumulative_sums(values):
+    """Prefix sums of counts, values and squares along the time axis.
+
+    Values are centered on each column's mean before summing, which keeps
+    the squared sums small and avoids cancellation in the variance. NaNs
+    are treated as missing observations.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    squeeze = values.ndim == 1
+    if squeeze:
+        values = values[:, None]
+
+    finite = np.isfinite(values)
+    with np.errstate(invalid='ignore'):
+        reference = np.nanmean(np.where(finite, values, np.nan), axis=0)
+    reference = np.where(np.isfinite(reference), reference, 0.0)
+    centered = np.where(finite, values - reference, 0.0)
+
+    n, m = values.shape
+    sums = np.zeros((3, n + 1, m))
+    np.cumsum(finite, axis=0, out=sums[0, 1:])
+    np.cumsum(centered, axis=0, out=sums[1, 1:])
+    np.cumsum(centered * centered, axis=0, out=sums[2, 1:])
+    return sums, reference, squeeze
+
+
+def _window_moments(sums, reference, window, min_periods, ddof):
+    """Trailing-window mean and std from prefix sums"""
+    if window < 1:
+        raise ValueError("window must be at least 1")
+    count, total, total_sq = sums[:, 1:].copy()
+    if window < len(count):
+        count[window:] -= sums[0, 1:-window]
+        total[window:] -= sums[1, 1:-window]
+        total_sq[window:] -= sums[2, 1:-window]
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = total / count
+        var = (total_sq - total * mean) / (count - ddof)
+    std = np.sqrt(np.maximum(var, 0.0))
+
+    valid = count >= max(min_periods, 1 + ddof)
+    mean = np.where(count >= max(min_periods, 1), mean + reference, np.nan)
+    std = np.where(valid, std, np.nan)
+    return mean, std
+
+
+def rolling_mean_std(values, window, min_periods=1, ddof=0):
+    """Trailing rolling mean and standard deviation in O(n).
+
+    `values` is a 1-D series or a 2-D (time, series) array; each column is
+    processed independently. The window expands over the first
+    `window - 1` points, so outputs are aligned with the input.
+    """
+    sums, reference, squeeze = _cumulative_sums(values)
+    mean, std = _window_moments(sums, reference, window, min_periods, ddof)
+    if squeeze:
+        return mean[:, 0], std[:, 0]
+    return mean, std
+
+
+def rolling_mean(values, window, min_periods=1):
+    return rolling_mean_std(values, window, min_periods)[0]
+
+
+def rolling_std(values, window, min_periods=1, ddof=0):
+    return rolling_mean_std(values, window, min_periods, ddof)[1]
+
+
+def _zscore(values, mean, std):
+    with np.errstate(invalid='ignore', divide='ignore'):
+        z = (values - mean) / std
+    return np.where(std > 0, z, np.nan)
+
+
+def rolling_zscore(values, window, min_periods=2, ddof=0):
+    """Z-score of each point against its trailing window"""
+    values = np.asarray(values, dtype=np.float64)
+    mean, std = rolling_mean_std(values, window, min_periods, ddof)
+    return _zscore(values, mean, std)
+
+
+def rolling_stats(values, windows=tuple(HORIZON_WINDOWS.values()), min_periods=2, ddof=0):
+    """Rolling mean, std and z-score for several windows at once.
+
+    The prefix sums are computed once and shared by every window. Returns
+    a dict mapping each window to a (mean, std, zscore) tuple shaped like
+    `values`.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    sums, reference, squeeze = _cumulative_sums(values)
+    stats = {}
+    for window in windows:
+        mean, std = _window_moments(sums, reference, window, min_periods, ddof)
+        if squeeze:
+            mean, std = mean[:, 0], std[:, 0]
+        stats[window] = (mean, std, _zscore(values, mean, std))
+    return stats
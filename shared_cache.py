@@ -0,0 +1,140 @@
+import json
+import os
+import time
+import uuid
+
+import diskcache
+
+from instrumentation import stage
+
+ENTRIES_DIR = 'entries'
+META_DIR = 'meta'
+
+
+class SharedCache:
+    """Figure and analytics cache shared by every worker process on a host.
+
+    Drop-in for FigureCache, backed by a diskcache directory (SQLite index
+    plus files) that all gunicorn workers open. Entries are evicted least
+    recently used once they pass `size_limit` bytes. Keys carry `dataset`,
+    an identity of the data the entries are built from (such as a hash of
+    the histories), so entries outlive restarts but never data changes.
+    They also carry the global generation and the bond's version, which
+    live in a separate small store so eviction never resets them;
+    `invalidate` in one worker is seen by all. On a miss one worker takes
+    a build lock and the others wait for its result instead of computing
+    the same entry.
+    """
+
+    def __init__(self, directory, size_limit=1 << 30, ttl=None, lock_timeout=60,
+                 poll_interval=0.05, dataset=None):
+        self.directory = directory
+        self.dataset = dataset
+        self.ttl = ttl
+        self.lock_timeout = lock_timeout
+        self.poll_interval = poll_interval
+        self._entries = diskcache.Cache(os.path.join(directory, ENTRIES_DIR),
+                                        size_limit=size_limit, tag_index=True,
+                                        eviction_policy='least-recently-used')
+        self._meta = diskcache.Cache(os.path.join(directory, META_DIR))
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def hits(self):
+        return self._meta.get('hits', 0)
+
+    @property
+    def misses(self):
+        return self._meta.get('misses', 0)
+
+    def version(self, bond):
+        return self._meta.get(('version', bond), 0)
+
+    def generation(self):
+        return self._meta.get('generation', 0)
+
+    def _key(self, kind, bond, params):
+        return (kind, bond, self.dataset, self.generation(), self.version(bond), params)
+
+    def _get(self, key):
+        value = self._entries.get(key)
+        self._meta.incr('misses' if value is None else 'hits')
+        return value
+
+    def _build_once(self, key, build, encode):
+        """Builds and stores an entry, or waits while another worker does.
+
+        Returns (result, None) after building, or (None, value) with the
+        stored value another worker produced. A lock left by a crashed
+        worker expires after `lock_timeout` seconds.
+        """
+        bond, dataset, generation, version = key[1:5]
+        lock, token = ('lock',) + key, uuid.uuid4().hex
+        while not self._meta.add(lock, token, expire=self.lock_timeout):
+            time.sleep(self.poll_interval)
+            value = self._entries.get(key)
+            if value is not None:
+                return None, value
+
+        try:
+            # The previous lock holder may have stored it just before releasing
+            value = self._entries.get(key)
+            if value is not None:
+                return None, value
+            result = build()
+            if (dataset, generation, version) == (self.dataset, self.generation(), self.version(bond)):
+                self._entries.set(key, encode(result), expire=self.ttl, tag=bond)
+        finally:
+            if self._meta.get(lock) == token:
+                self._meta.delete(lock)
+        return result, None
+
+    def get_or_build(self, bond, params, build):
+        """Returns the cached figures for a key, building them on a miss.
+
+        `build` returns a figure or a tuple of figures; hits return the
+        same shape as plain figure dicts.
+        """
+        key = self._key('figures', bond, params)
+        payload = self._get(key)
+        if payload is None:
+            result, payload = self._build_once(key, build, _encode_figures)
+            if payload is None:
+                return result
+
+        is_tuple, figure_json = payload
+        with stage('serialize'):
+            figures = [json.loads(fig_json) for fig_json in figure_json]
+        return tuple(figures) if is_tuple else figures[0]
+
+    def get_or_compute(self, bond, params, compute):
+        """Returns a cached picklable value (arrays, frames), computing it on a miss"""
+        key = self._key('values', bond, params)
+        value = self._get(key)
+        if value is None:
+            result, value = self._build_once(key, compute, lambda result: result)
+            if value is None:
+                return result
+        return value
+
+    def invalidate(self, bond=None):
+        """Drops cached entries for one bond, or for every bond, in all workers"""
+        if bond is None:
+            self._meta.incr('generation')
+            self._entries.clear()
+            return
+        self._meta.incr(('version', bond))
+        self._entries.evict(bond)
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries),
+                'bytes': self._entries.volume()}
+
+
+def _encode_figures(result):
+    is_tuple = isinstance(result, tuple)
+    figures = result if is_tuple else (result,)
+    with stage('serialize'):
+        return is_tuple, tuple(fig.to_json() for fig in figures)
@@ -5,8 +5,10 @@ def create_sidebar():
         # Search
         html.Div([
             dcc.Input(
+                id='bond-search',
                 placeholder="Search instruments...",
                 type="text",
+                debounce=True,
                 className="w-full px-4 py-2 bg-gray-800 text-gray-100 border border-gray-700 rounded-lg focus:outline-none focus:border-blue-500"
             )
         ], className="mb-6"),
@@ -33,6 +35,7 @@ def create_sidebar():
                         {'label': 'Financial', 'value': 'FIN'},
                         {'label': 'Technology', 'value': 'TECH'},
                         {'label': 'Energy', 'value': 'ENGY'},
+                        {'label': 'Sovereign', 'value': 'SOV'},
                     ],
                     className="bg-gray-800 text-gray-200"
                 )
@@ -48,6 +51,7 @@ def create_sidebar():
                         {'label': 'AA', 'value': 'AA'},
                         {'label': 'A', 'value': 'A'},
                         {'label': 'BBB', 'value': 'BBB'},
+                        {'label': 'BB', 'value': 'BB'},
                     ],
                     className="bg-gray-800 text-gray-200"
                 )
@@ -57,8 +61,21 @@ def create_sidebar():
             html.Div([
                 html.Label("Basis Threshold (bps)", className="text-sm text-gray-400"),
                 dcc.Input(
+                    id='basis-threshold',
                     type="number",
-                    value=50,
+                    placeholder="Any",
+                    className="w-full px-4 py-2 bg-gray-800 text-gray-100 border border-gray-700 rounded-lg"
+                )
+            ], className="mb-4"),
+            
+            # Z-score Threshold
+            html.Div([
+                html.Label("Z-score Threshold (σ)", className="text-sm text-gray-400"),
+                dcc.Input(
+                    id='zscore-threshold',
+                    type="number",
+                    step=0.5,
+                    placeholder="Any",
                     className="w-full px-4 py-2 bg-gray-800 text-gray-100 border border-gray-700 rounded-lg"
                 )
             ], className="mb-4"),
@@ -68,10 +85,12 @@ def create_sidebar():
         html.Div([
             html.Button(
                 "Apply Filters",
+                id='apply-filters',
                 className="w-full mb-2 px-4 py-2 bg-blue-600 text-white rounded-lg hover:bg-blue-700"
             ),
             html.Button(
                 "Reset",
+                id='reset-filters',
                 className="w-full px-4 py-2 bg-gray-700 text-white rounded-lg hover:bg-gray-600"
             ),
         ], className="mt-auto")
@@ -0,0 +1,316 @@
+"""End-of-day snapshots of everything the dashboard shows at startup.
+
+The pipeline computes the table metrics of the whole universe (z-scores
+included), every bond's distribution densities and its full-history
+chart series, and writes them with a copy of the histories to a new
+version directory. LATEST is then switched to it atomically, so readers
+see either the previous version or the complete new one:
+
+    ROOT/LATEST                  name of the current version
+    ROOT/20251017T220000-1a2b3c/
+        meta.json                bonds, countries and build parameters
+        table_<column>.npy       table metric columns
+        dist_*.npy               distribution grids and densities per bond
+        series_*.npy             downsampled chart rows and values per bond
+        history/                 HistoryStore layout
+
+Arrays are plain, uncompressed .npy files so the dashboard can
+memory-map them: a compressed .npz has to be inflated into memory on
+every load, which defeats mapping. Densities and chart series are
+float32, the precision the browser receives anyway, which halves them.
+
+    python snapshot.py snapshots/ --history history/ --basis basis.csv
+"""
+import argparse
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+
+import numpy as np
+import pandas as pd
+
+from basis_store import BasisStore, SAMPLE_BASIS, METRIC_COLUMNS
+from distributions import basis_distributions, SHORT_HORIZONS, LONG_HORIZONS, GRID_SIZE
+from history_store import HistoryStore
+from plot_payload import MAX_CHART_POINTS
+from pyramid import HistoryPyramid
+from rolling import rolling_mean_std
+from zscores import compute_basis_zscores
+
+logger = logging.getLogger(__name__)
+
+LATEST_FILE = 'LATEST'
+META_FILE = 'meta.json'
+HISTORY_DIR = 'history'
+
+# Rolling window of the chart bands; matches the dashboard's BASIS_WINDOW
+CHART_WINDOW = 20
+
+# Bonds whose rolling statistics are computed together
+CHUNK_BONDS = 512
+
+
+def latest_version(root):
+    """Returns the name of the current version under `root`, or None"""
+    try:
+        with open(os.path.join(root, LATEST_FILE)) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def _save(path, name, array):
+    np.save(os.path.join(path, f'{name}.npy'), np.ascontiguousarray(array))
+
+
+def _write_distributions(path, history, horizons):
+    """Writes the current basis, grid start and step, and densities of every bond"""
+    count = len(history)
+    current = np.full(count, np.nan)
+    low = np.full((count, len(horizons)), np.nan)
+    step = np.full((count, len(horizons)), np.nan)
+    densities = np.lib.format.open_memmap(os.path.join(path, 'dist_densities.npy'), mode='w+',
+                                          dtype=np.float32, shape=(count, len(horizons), GRID_SIZE))
+    for i in range(count):
+        current[i], grids, densities[i] = basis_distributions(history.values[:, i], horizons,
+                                                             dates=history.dates)
+        # Each grid is regular, so its first point and spacing describe it
+        low[i] = grids[:, 0]
+        step[i] = (grids[:, -1] - grids[:, 0]) / (GRID_SIZE - 1)
+    densities.flush()
+    del densities
+    _save(path, 'dist_current', current)
+    _save(path, 'dist_low', low)
+    _save(path, 'dist_step', step)
+
+
+def _write_chart_series(path, history, window, max_points):
+    """Writes each bond's full-view chart rows and their basis, mean and std.
+
+    Bonds have different numbers of rows, so they are concatenated and
+    `series_offsets` marks where each bond starts.
+    """
+    rows, values, offsets = [], [], [0]
+    for start in range(0, len(history), CHUNK_BONDS):
+        chunk = np.asarray(history.values[:, start:start + CHUNK_BONDS], dtype=np.float64)
+        means, stds = rolling_mean_std(chunk, window)
+        for j in range(chunk.shape[1]):
+            kept = HistoryPyramid(history.dates, chunk[:, j]).window(max_points=max_points)
+            rows.append(kept.astype(np.int32))
+            values.append(np.column_stack([chunk[kept, j], means[kept, j], stds[kept, j]]))
+            offsets.append(offsets[-1] + len(kept))
+    _save(path, 'series_offsets', np.array(offsets, dtype=np.int64))
+    _save(path, 'series_rows', np.concatenate(rows) if rows else np.empty(0, np.int32))
+    _save(path, 'series_values', (np.concatenate(values) if values
+                                  else np.empty((0, 3))).astype(np.float32))
+
+
+def write_snapshot(path, basis_store, history, window=CHART_WINDOW, max_points=MAX_CHART_POINTS,
+                   horizons=SHORT_HORIZONS + LONG_HORIZONS):
+    """Computes every precomputed view of the data and writes it to `path`"""
+    os.makedirs(path)
+
+    # Table metrics, with the z-scores brought up to date from the histories
+    zscores = compute_basis_zscores(history.values, history.bonds)
+    basis_store.update(zscores[zscores['Bond'].isin(basis_store.bonds)])
+    for name in METRIC_COLUMNS:
+        _save(path, f'table_{name}', basis_store.column(name))
+
+    _write_distributions(path, history, horizons)
+    _write_chart_series(path, history, window, max_points)
+    history.write(os.path.join(path, HISTORY_DIR))
+
+    with open(os.path.join(path, META_FILE), 'w') as f:
+        json.dump({
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'bonds': basis_store.bonds.tolist(),
+            'countries': basis_store.column('Country').tolist(),
+            'window': window,
+            'max_points': max_points,
+            'horizons': list(horizons),
+            'horizon_unit': 'days',
+        }, f)
+
+
+def publish(root, basis_store, history, keep=5, **params):
+    """Builds a new version under `root`, makes it the latest and prunes old ones.
+
+    The version is written to a hidden directory and renamed into place
+    before LATEST points at it, so readers never see a partial version.
+    Returns the new version's name.
+    """
+    os.makedirs(root, exist_ok=True)
+    version = f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:6]}"
+    building = os.path.join(root, f'.{version}')
+    try:
+        write_snapshot(building, basis_store, history, **params)
+        os.rename(building, os.path.join(root, version))
+    finally:
+        shutil.rmtree(building, ignore_errors=True)
+
+    pointer = os.path.join(root, f'.{LATEST_FILE}-{version}')
+    with open(pointer, 'w') as f:
+        f.write(version)
+    os.replace(pointer, os.path.join(root, LATEST_FILE))
+
+    # Processes still mapping a pruned version keep their pages until they swap
+    versions = sorted(name for name in os.listdir(root)
+                      if not name.startswith('.') and os.path.isdir(os.path.join(root, name)))
+    for name in versions[:-keep] if keep else []:
+        if name != version:
+            shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+    return version
+
+
+class Snapshot:
+    """A published snapshot version, memory-mapped.
+
+    Distribution and chart arrays stay on disk until a bond is read, so
+    opening a snapshot costs the same whatever the size of the universe.
+    """
+
+    def __init__(self, path, version):
+        self.path = path
+        self.version = version
+        with open(os.path.join(path, META_FILE)) as f:
+            self.meta = json.load(f)
+        self.history = HistoryStore.open(os.path.join(path, HISTORY_DIR))
+        self._arrays = {}
+
+    @classmethod
+    def open(cls, root, version=None):
+        """Opens a version under `root`, by default the latest"""
+        version = version or latest_version(root)
+        if version is None:
+            raise FileNotFoundError(f"No snapshot has been published to {root}")
+        return cls(os.path.join(root, version), version)
+
+    def __contains__(self, bond):
+        return bond in self.history
+
+    def _array(self, name):
+        if name not in self._arrays:
+            self._arrays[name] = np.load(os.path.join(self.path, f'{name}.npy'), mmap_mode='r')
+        return self._arrays[name]
+
+    def table_frame(self):
+        """Returns the table metrics as a frame ready for BasisStore"""
+        return pd.DataFrame({'Bond': self.meta['bonds'], 'Country': self.meta['countries'],
+                             **{name: np.load(os.path.join(self.path, f'table_{name}.npy'))
+                                for name in METRIC_COLUMNS}})
+
+    def distributions(self, bond, horizons):
+        """Returns (current, grids, densities) as basis_distributions does.
+
+        None when the bond is not in the snapshot or the snapshot was built
+        for other horizons, including older ones counting observations.
+        """
+        if (bond not in self or list(horizons) != self.meta['horizons']
+                or self.meta.get('horizon_unit') != 'days'):
+            return None
+        i = self.history.position(bond)
+        low, step = self._array('dist_low')[i], self._array('dist_step')[i]
+        grids = low[:, None] + step[:, None] * np.arange(GRID_SIZE)
+        return self._array('dist_current')[i], grids, self._array('dist_densities')[i]
+
+    def chart_series(self, bond, window, max_points):
+        """Returns the full-view (dates, basis, mean, std) of a bond's chart.
+
+        None when the bond is not in the snapshot or the snapshot was built
+        for another window or point budget.
+        """
+        if (bond not in self or window != self.meta['window']
+                or max_points != self.meta['max_points']):
+            return None
+        i = self.history.position(bond)
+        start, end = self._array('series_offsets')[i:i + 2]
+        rows = self._array('series_rows')[start:end]
+        values = self._array('series_values')[start:end]
+        return self.history.dates[rows], values[:, 0], values[:, 1], values[:, 2]
+
+
+class SnapshotWatcher(threading.Thread):
+    """Background poller calling `on_change(version)` when LATEST moves"""
+
+    def __init__(self, root, on_change, version=None, interval=30.0):
+        super().__init__(daemon=True)
+        self.root = root
+        self.on_change = on_change
+        self.version = version
+        self.interval = interval
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            version = latest_version(self.root)
+            if version is None or version == self.version:
+                continue
+            try:
+                self.on_change(version)
+            except Exception:
+                # Keep serving the current version and retry on the next poll
+                logger.exception("Could not load snapshot %s", version)
+                continue
+            logger.info("Loaded snapshot %s", version)
+            self.version = version
+
+
+# Columns a basis CSV must provide; the z-score columns are computed from the histories
+REQUIRED_BASIS_COLUMNS = ['Bond', 'Country', 'Live', 'CoD']
+
+
+def load_basis(path):
+    """Reads table metrics from a CSV with Bond, Country, Live and CoD columns.
+
+    Live and CoD are whole basis points and must be filled for every bond;
+    missing z-score columns start as NaN.
+    """
+    frame = pd.read_csv(path)
+    missing = [name for name in REQUIRED_BASIS_COLUMNS if name not in frame.columns]
+    if missing:
+        raise ValueError(f"{path} is missing basis columns: {missing}")
+    for name in ('Live', 'CoD'):
+        values = pd.to_numeric(frame[name], errors='coerce')
+        if values.isna().any() or (values % 1 != 0).any():
+            raise ValueError(f"{path}: {name} must be a whole number for every bond")
+        frame[name] = values.astype(np.int64)
+    for name in METRIC_COLUMNS:
+        if name not in frame.columns:
+            frame[name] = np.nan
+    return BasisStore(frame)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('root', help="directory holding the snapshot versions")
+    parser.add_argument('--history', help="HistoryStore directory (default: synthetic histories)")
+    parser.add_argument('--basis', help="CSV of table metrics (default: the sample universe)")
+    parser.add_argument('--window', type=int, default=CHART_WINDOW, help="chart band window")
+    parser.add_argument('--max-points', type=int, default=MAX_CHART_POINTS,
+                        help="points per chart trace")
+    parser.add_argument('--keep', type=int, default=5, help="versions to keep")
+    args = parser.parse_args(argv)
+
+    try:
+        basis_store = (load_basis(args.basis) if args.basis
+                       else BasisStore.from_country_dicts(SAMPLE_BASIS))
+    except ValueError as error:
+        parser.exit(1, f"{error}\n")
+    history = (HistoryStore.open(args.history) if args.history
+               else HistoryStore.synthetic(basis_store.bonds))
+    started = time.perf_counter()
+    version = publish(args.root, basis_store, history, keep=args.keep,
+                      window=args.window, max_points=args.max_points)
+    print(f"Published {version} ({len(basis_store)} bonds, {len(history.dates)} dates) "
+          f"in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,204 @@
+import hashlib
+import json
+
+import numpy as np
+import pandas as pd
+
+
+class SparseSeries:
+    """Mostly-zero daily series stored as COO triplets sorted by column.
+
+    Holds the date index, the column names and the (row, column, value)
+    of every nonzero cell. Entries are sorted by column and then row, so
+    one column is a contiguous slice found through `indptr` (CSC layout).
+    Aggregations work on the nonzeros only and never build the dense
+    date x column matrix.
+
+    It also offers the HistoryStore interface (`bonds`, `values`,
+    `history`), so the dashboard can hold mostly-zero histories this way.
+    """
+
+    def __init__(self, dates, columns, rows, cols, data, presorted=False):
+        self.dates = np.asarray(dates, dtype='datetime64[D]')
+        self.columns = list(columns)
+        self.rows = np.asarray(rows, dtype=np.int32)
+        self.cols = np.asarray(cols, dtype=np.int32)
+        self.data = np.asarray(data, dtype=np.float32)
+        if not presorted:
+            order = np.lexsort((self.rows, self.cols))
+            self.rows, self.cols, self.data = self.rows[order], self.cols[order], self.data[order]
+        self.indptr = np.searchsorted(self.cols, np.arange(len(self.columns) + 1))
+        self._positions = {column: i for i, column in enumerate(self.columns)}
+        self._fingerprint = None
+
+    @classmethod
+    def from_dense(cls, dates, columns, values, chunk_rows=4096):
+        """Builds from a dense (or memory-mapped) date x column matrix, in row chunks"""
+        parts = []
+        for start in range(0, len(values), chunk_rows):
+            block = np.asarray(values[start:start + chunk_rows])
+            rows, cols = np.nonzero(block)
+            parts.append((rows + start, cols, block[rows, cols]))
+        if not parts:
+            parts = [(np.empty(0, int), np.empty(0, int), np.empty(0))]
+        rows, cols, nonzero = (np.concatenate(p) for p in zip(*parts))
+        return cls(dates, columns, rows, cols, nonzero)
+
+    @classmethod
+    def from_history(cls, store):
+        """Builds from a HistoryStore, e.g. one returned by load_wide_csv, keeping its fingerprint"""
+        series = cls.from_dense(store.dates, store.bonds, store.values)
+        series._fingerprint = store.fingerprint()
+        return series
+
+    @property
+    def bonds(self):
+        return self.columns
+
+    @property
+    def values(self):
+        """The dense date x column matrix, column-major like HistoryStore's.
+
+        Built on every access; meant for whole-history passes such as the
+        z-scores, while charts read single columns through `history`.
+        """
+        dense = np.zeros(self.shape, dtype=np.float64, order='F')
+        dense[self.rows, self.cols] = self.data
+        return dense
+
+    def __len__(self):
+        return len(self.columns)
+
+    def position(self, column):
+        return self._positions[column]
+
+    def fingerprint(self):
+        """Hash of the dates, columns and entries, identifying the data in cache keys"""
+        if self._fingerprint is None:
+            digest = hashlib.blake2b(digest_size=16)
+            digest.update(json.dumps(self.columns).encode())
+            for array in (self.dates, self.rows, self.cols, self.data):
+                digest.update(array.tobytes())
+            self._fingerprint = digest.hexdigest()
+        return self._fingerprint
+
+    @property
+    def shape(self):
+        return len(self.dates), len(self.columns)
+
+    @property
+    def nnz(self):
+        return len(self.data)
+
+    @property
+    def density(self):
+        return self.nnz / max(self.shape[0] * self.shape[1], 1)
+
+    def __contains__(self, column):
+        return column in self._positions
+
+    def column(self, column):
+        """Returns (rows, values) of a column's nonzero entries"""
+        i = self._positions[column]
+        entries = slice(self.indptr[i], self.indptr[i + 1])
+        return self.rows[entries], self.data[entries]
+
+    def history(self, column):
+        """Returns (dates, values) for one column, densified for charting.
+
+        Matches HistoryStore.history so the series can back the basis chart.
+        """
+        rows, values = self.column(column)
+        dense = np.zeros(len(self.dates), dtype=np.float64)
+        dense[rows] = values
+        return self.dates, dense
+
+    def totals(self):
+        """Per-column sums"""
+        return np.bincount(self.cols, weights=self.data, minlength=len(self.columns))
+
+    def resample(self, freq='W'):
+        """Sums the entries into weekly ('W') or monthly ('M') periods.
+
+        Periods are labelled by the date they start on; the result is
+        another SparseSeries with one row per period.
+        """
+        if freq == 'W':
+            # datetime64 weeks start on Thursday (1970-01-01); shift to Mondays
+            starts = (self.dates + np.timedelta64(3, 'D')).astype('datetime64[W]')
+            starts = starts.astype('datetime64[D]') - np.timedelta64(3, 'D')
+        elif freq == 'M':
+            starts = self.dates.astype('datetime64[M]').astype('datetime64[D]')
+        else:
+            raise ValueError(f"Unsupported frequency: {freq}")
+        periods, period_of_row = np.unique(starts, return_inverse=True)
+        if not self.nnz:
+            return SparseSeries(periods, self.columns, self.rows, self.cols, self.data)
+
+        # Entries are sorted by column then row, so (column, period) keys are
+        # already sorted and each output cell is a run of equal keys
+        keys = self.cols.astype(np.int64) * len(periods) + period_of_row[self.rows]
+        run_starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        sums = np.add.reduceat(self.data.astype(np.float64), run_starts)
+        keep = sums != 0
+        cols, rows = np.divmod(keys[run_starts][keep], len(periods))
+        return SparseSeries(periods, self.columns, rows, cols, sums[keep], presorted=True)
+
+    def rolling_sum(self, window):
+        """Trailing `window`-row sums of every column.
+
+        Each entry adds its value at its own row and removes it `window`
+        rows later, so every column is a step function whose steps are
+        found by a cumulative sum over those events. Only rows where the
+        sum is nonzero are materialized.
+        """
+        n = len(self.dates)
+        if not self.nnz:
+            return self
+        event_rows = np.concatenate([self.rows, self.rows + window])
+        event_cols = np.concatenate([self.cols, self.cols])
+        deltas = np.concatenate([self.data, -self.data]).astype(np.float64)
+        inside = event_rows < n
+        event_rows, event_cols, deltas = event_rows[inside], event_cols[inside], deltas[inside]
+
+        # Merge events on the same cell, ordered by column and then row
+        keys = event_cols.astype(np.int64) * (n + 1) + event_rows
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        deltas = np.bincount(inverse, weights=deltas, minlength=len(unique_keys))
+        cols, rows = np.divmod(unique_keys, n + 1)
+
+        # Running level per column: global cumulative sum minus the earlier columns
+        levels = np.cumsum(deltas)
+        starts = np.r_[True, cols[1:] != cols[:-1]]
+        first = np.maximum.accumulate(np.where(starts, np.arange(len(cols)), 0))
+        levels -= (levels - deltas)[first]
+        tolerance = 1e-9 * max(np.abs(levels).max(), 1.0)
+
+        # Each level holds until the next event in the same column
+        ends = np.r_[rows[1:], n]
+        ends = np.where(np.r_[cols[1:] != cols[:-1], True], n, ends)
+        nonzero = np.abs(levels) > tolerance
+        lengths = (ends - rows)[nonzero]
+        out_rows = np.repeat(rows[nonzero].astype(np.int32), lengths) + _ranges(lengths)
+        return SparseSeries(self.dates, self.columns, out_rows,
+                            np.repeat(cols[nonzero].astype(np.int32), lengths),
+                            np.repeat(levels[nonzero].astype(np.float32), lengths),
+                            presorted=True)
+
+    def to_dense(self):
+        dense = np.zeros(self.shape, dtype=np.float32)
+        dense[self.rows, self.cols] = self.data
+        return dense
+
+    def to_frame(self):
+        return pd.DataFrame(self.to_dense(), index=pd.DatetimeIndex(self.dates),
+                            columns=self.columns)
+
+
+def _ranges(lengths):
+    """Concatenation of arange(length) for every length"""
+    total = int(lengths.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int32)
+    starts = (np.cumsum(lengths) - lengths).astype(np.int32)
+    return np.arange(total, dtype=np.int32) - np.repeat(starts, lengths)
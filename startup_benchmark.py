@@ -0,0 +1,141 @@
+"""Import-time benchmark for the dashboard modules.
+
+Imports each module in a fresh interpreter under `python -X importtime`,
+keeps the fastest of several runs, and prints the time spent running the
+app's own modules, the total import time, and the packages the app's own
+modules import directly (what dash or pandas pull in internally is part
+of their time, not listed).
+
+The gate only looks at what this repository controls: it exits with
+status 1 when the app's own modules got slower than the tolerance allows
+against a saved baseline, or when the app starts importing a heavy
+package it did not before. Total times are dominated by third-party
+imports and vary too much between runs and machines to gate on.
+
+    python startup_benchmark.py              # check against startup_baseline.json
+    python startup_benchmark.py --update     # record this machine's baseline
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+MODULES = ('dashboard', 'chart', 'backfill', 'csv_loader', 'sparse_series')
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_FILE = os.path.join(REPO_DIR, 'startup_baseline.json')
+
+# Modules of this repository; packages they import make up the app's import chain
+LOCAL_MODULES = frozenset(name[:-3] for name in os.listdir(REPO_DIR) if name.endswith('.py'))
+
+# Packages whose import takes longer than this (ms) count as heavy
+HEAVY_MS = 20
+
+
+def parse_importtime(stderr):
+    """Maps each imported module to its (self, cumulative) import time in µs and its importer.
+
+    Nesting is shown by indentation, and a module is listed after the
+    modules it imports, so each entry adopts the pending entries one
+    level deeper. Modules imported at the top level have no importer.
+    """
+    times, pending = {}, {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, label = line[len('import time:'):].split('|')
+        name = label.strip()
+        depth = (len(label) - len(label.lstrip()) - 1) // 2
+        for child in pending.pop(depth + 1, []):
+            times[child] = times[child][:2] + (name,)
+        times.setdefault(name, (int(self_us), int(cumulative_us), None))
+        pending.setdefault(depth, []).append(name)
+    return times
+
+
+def import_times(module, repeat=5):
+    """Best-of-`repeat` import times of a module and everything it imports"""
+    best = {}
+    for _ in range(repeat):
+        proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                              capture_output=True, text=True, check=True,
+                              cwd=REPO_DIR)
+        for name, (self_us, cumulative_us, parent) in parse_importtime(proc.stderr).items():
+            previous = best.get(name, (self_us, cumulative_us, parent))
+            best[name] = min(previous[0], self_us), min(previous[1], cumulative_us), previous[2]
+    return best
+
+
+def summarize(module, times):
+    """Own, total and per-package import times of a module.
+
+    `local_us` is the self time of the app's own modules: their module
+    code, without the packages they import. `packages` holds the
+    cumulative time of each third-party package they import directly.
+    """
+    local_us, packages = 0, {}
+    for name, (self_us, cumulative_us, parent) in times.items():
+        package = name.split('.')[0]
+        if package in LOCAL_MODULES:
+            local_us += self_us
+        elif parent and parent.split('.')[0] in LOCAL_MODULES:
+            packages[package] = max(packages.get(package, 0), cumulative_us)
+    return {'local_us': local_us, 'total_us': times[module][1],
+            'packages': dict(sorted(packages.items(), key=lambda p: -p[1]))}
+
+
+def compare(results, baseline, tolerance, slack_ms):
+    """Returns a message for every module that regressed against the baseline"""
+    failures = []
+    for module, result in results.items():
+        if module not in baseline:
+            continue
+        allowed = baseline[module]['local_us'] * (1 + tolerance) + slack_ms * 1000
+        if result['local_us'] > allowed:
+            failures.append(f"{module}: own modules take {result['local_us'] / 1000:.0f} ms, "
+                            f"baseline {baseline[module]['local_us'] / 1000:.0f} ms")
+        for package, us in result['packages'].items():
+            if us >= HEAVY_MS * 1000 and package not in baseline[module]['packages']:
+                failures.append(f"{module}: now imports {package} ({us / 1000:.0f} ms)")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('modules', nargs='*', default=MODULES, help="modules to import")
+    parser.add_argument('--repeat', type=int, default=5, help="runs per module; the fastest counts")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="allowed relative slowdown against the baseline")
+    parser.add_argument('--slack-ms', type=float, default=10,
+                        help="allowed absolute slowdown, to absorb timer noise")
+    parser.add_argument('--baseline', default=BASELINE_FILE, help="baseline JSON file")
+    parser.add_argument('--update', action='store_true', help="write the results as the new baseline")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for module in args.modules:
+        results[module] = summarize(module, import_times(module, args.repeat))
+        heavy = ', '.join(f"{package} {us / 1000:.0f}" for package, us
+                          in list(results[module]['packages'].items())[:6] if us >= HEAVY_MS * 1000)
+        print(f"{module:>15}: {results[module]['local_us'] / 1000:5.0f} ms own, "
+              f"{results[module]['total_us'] / 1000:5.0f} ms total  ({heavy or 'no heavy imports'})")
+
+    if args.update:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Wrote {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update to record one")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    failures = compare(results, baseline, args.tolerance, args.slack_ms)
+    for failure in failures:
+        print(f"REGRESSION {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,82 @@
+"""backfill: chunked fits, resuming, and the manifest guarding reused chunks"""
+import json
+import os
+
+import numpy as np
+import pytest
+
+from backfill import backfill, CHUNKS_DIR, MANIFEST_FILE
+from curve_fit import fit_spread_curve
+from daycount import time_to_maturity
+
+
+def write_input(path, seed=8, dates=25, bonds=20):
+    rng = np.random.default_rng(seed)
+    valuation = np.datetime64('2024-01-02') + np.arange(dates)
+    maturities = np.datetime64('2025-01-15') + np.sort(rng.integers(0, 365 * 25, bonds))
+    irs = 4 + rng.normal(0, 0.05, (dates, bonds))
+    ttm = time_to_maturity(maturities, valuation)
+    yields = irs + 0.4 + 0.1 * np.log(ttm) + rng.normal(0, 0.02, (dates, bonds))
+    yields[rng.random(yields.shape) < 0.1] = np.nan
+    np.savez(path, dates=valuation, maturities=maturities, yields=yields, irs_rates=irs)
+    return valuation, maturities, yields, irs
+
+
+@pytest.fixture
+def run(tmp_path):
+    input_path = tmp_path / 'history.npz'
+    inputs = write_input(input_path)
+    output = str(tmp_path / 'curves')
+
+    def run(**options):
+        return np.load(backfill(str(input_path), output, workers=2, chunk_size=10, **options))
+    return run, inputs, input_path, output
+
+
+def chunk_files(output):
+    return sorted(os.listdir(os.path.join(output, CHUNKS_DIR)))
+
+
+def test_matches_a_single_fit(run):
+    run, (dates, maturities, yields, irs), _, _ = run
+    ttm = time_to_maturity(maturities, dates)
+    expected = fit_spread_curve(ttm, np.where(ttm > 0, yields - irs, np.nan))
+    np.testing.assert_allclose(run(), expected)
+
+
+def test_resumes_missing_chunks(run, capsys):
+    run, _, _, output = run
+    curves = run()
+    first, *rest = chunk_files(output)
+    mtimes = {name: os.stat(os.path.join(output, CHUNKS_DIR, name)).st_mtime_ns for name in rest}
+    os.remove(os.path.join(output, CHUNKS_DIR, first))
+    capsys.readouterr()
+
+    np.testing.assert_array_equal(run(), curves)
+    assert "2 of 3 chunks already done" in capsys.readouterr().out
+    assert chunk_files(output) == [first, *rest]
+    for name in rest:
+        assert os.stat(os.path.join(output, CHUNKS_DIR, name)).st_mtime_ns == mtimes[name]
+
+
+def test_refuses_chunks_from_other_settings(run):
+    run, _, _, output = run
+    run()
+    with pytest.raises(ValueError, match='frac'):
+        run(frac=0.5)
+    with open(os.path.join(output, MANIFEST_FILE)) as f:
+        assert json.load(f)['frac'] == 0.3
+
+    restarted = run(frac=0.5, restart=True)
+    with open(os.path.join(output, MANIFEST_FILE)) as f:
+        assert json.load(f)['frac'] == 0.5
+    np.testing.assert_array_equal(run(frac=0.5), restarted)
+
+
+def test_refuses_chunks_from_another_input(run):
+    run, _, input_path, _ = run
+    curves = run()
+    write_input(input_path, seed=9)
+    with pytest.raises(ValueError, match='input_sha256'):
+        run()
+    assert not np.allclose(run(restart=True), curves, equal_nan=True)
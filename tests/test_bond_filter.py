@@ -0,0 +1,101 @@
+"""BondFilter against brute-force filtering of the same universe"""
+import numpy as np
+import pytest
+
+from bond_filter import BondFilter
+
+COUNTRIES = ['COLOMBIA', 'BRAZIL', 'MEXICO', 'PERU']
+RATINGS = ['BB', 'BBB', 'A']
+
+
+@pytest.fixture
+def universe():
+    rng = np.random.default_rng(5)
+    n = 300
+    countries = rng.choice(COUNTRIES, n)
+    bonds = np.array([f'{country[:5]} {i % 50 + 25}s {i}' for i, country in enumerate(countries)],
+                     dtype=object)
+    ratings = rng.choice(RATINGS, n)
+    metrics = {name: rng.normal(0, 2, n).round(1) for name in ('Z3m', 'Z6m', 'Live')}
+    metrics['Z6m'][rng.random(n) < 0.1] = np.nan
+    bond_filter = BondFilter(bonds, {'Country': countries, 'Rating': ratings}, metrics)
+    return bond_filter, bonds, {'Country': countries, 'Rating': ratings}, metrics
+
+
+def brute_force(bonds, categories, metrics, search=None, accepted=None, min_magnitudes=None):
+    keep = np.ones(len(bonds), dtype=bool)
+    query = (search or '').strip().casefold()
+    if query:
+        names = [bond.casefold() for bond in bonds]
+        if len(query) < 3:
+            keep &= [any(token.startswith(query) for token in [name] + name.split())
+                     for name in names]
+        else:
+            keep &= [query in name for name in names]
+    for field, values in (accepted or {}).items():
+        if values:
+            values = [values] if isinstance(values, str) else values
+            keep &= np.isin(categories[field], values)
+    for names, threshold in (min_magnitudes or {}).items():
+        if threshold is not None:
+            with np.errstate(invalid='ignore'):
+                keep &= np.any([np.abs(metrics[name]) >= abs(threshold) for name in names], axis=0)
+    return np.flatnonzero(keep)
+
+
+@pytest.mark.parametrize('search', [None, '', 'c', 'BR', '3', '25s', 'colom', 'mexic 30s',
+                                    'PERU 7', 'zzz', ' peru '])
+def test_search(universe, search):
+    bond_filter, bonds, categories, metrics = universe
+    np.testing.assert_array_equal(bond_filter.matching(search=search),
+                                  brute_force(bonds, categories, metrics, search))
+
+
+@pytest.mark.parametrize('accepted', [
+    {'Country': 'PERU'},
+    {'Country': ['BRAZIL', 'MEXICO'], 'Rating': 'BBB'},
+    {'Country': [], 'Rating': ['A', 'AAA']},
+    {'Rating': ['AAA']},
+])
+def test_categories(universe, accepted):
+    bond_filter, bonds, categories, metrics = universe
+    np.testing.assert_array_equal(bond_filter.matching(categories=accepted),
+                                  brute_force(bonds, categories, metrics, accepted=accepted))
+
+
+@pytest.mark.parametrize('threshold', [0, 0.5, 1.3, -2, 4, 100])
+def test_magnitudes(universe, threshold):
+    bond_filter, bonds, categories, metrics = universe
+    magnitudes = {('Z3m', 'Z6m'): threshold, ('Live',): None}
+    np.testing.assert_array_equal(bond_filter.matching(min_magnitudes=magnitudes),
+                                  brute_force(bonds, categories, metrics,
+                                              min_magnitudes=magnitudes))
+
+
+def test_between(universe):
+    bond_filter, _, _, metrics = universe
+    for low, high in [(None, None), (-1, 1), (0.5, None), (None, -0.5), (3, -3)]:
+        with np.errstate(invalid='ignore'):
+            expected = np.isfinite(metrics['Z6m'])
+            if low is not None:
+                expected &= metrics['Z6m'] >= low
+            if high is not None:
+                expected &= metrics['Z6m'] <= high
+        np.testing.assert_array_equal(bond_filter.rows(bond_filter.between('Z6m', low, high)),
+                                      np.flatnonzero(expected))
+
+
+def test_combined_filters_after_metric_update(universe):
+    bond_filter, bonds, categories, metrics = universe
+    rng = np.random.default_rng(6)
+    moved = rng.choice(len(bonds), 20, replace=False)
+    metrics = {name: values.copy() for name, values in metrics.items()}
+    metrics['Z3m'][moved] += rng.normal(0, 3, len(moved))
+    bond_filter.update_metrics({'Z3m': metrics['Z3m']}, {'Z3m': 1})
+    assert bond_filter.versions['Z3m'] == 1
+
+    query = dict(search='s', accepted={'Country': ['COLOMBIA', 'PERU']},
+                 min_magnitudes={('Z3m', 'Z6m'): 1.5})
+    np.testing.assert_array_equal(
+        bond_filter.matching(query['search'], query['accepted'], query['min_magnitudes']),
+        brute_force(bonds, categories, metrics, **query))
@@ -0,0 +1,49 @@
+"""curve_fit's batched LOWESS against statsmodels"""
+import numpy as np
+import pytest
+
+from curve_fit import loess_smooth, fit_spread_curve, STANDARD_TENORS
+
+lowess = pytest.importorskip('statsmodels.nonparametric.smoothers_lowess').lowess
+
+
+@pytest.fixture
+def curves():
+    rng = np.random.default_rng(2)
+    ttm = np.sort(rng.uniform(0.5, 25, 30))
+    spread = 40 + 30 * np.log(ttm) + rng.normal(0, 5, (12, len(ttm)))
+    spread[3, 4] += 80  # an outlier for the robustness iterations
+    return ttm, spread
+
+
+@pytest.mark.parametrize('frac,it', [(0.3, 3), (0.5, 0), (0.8, 2)])
+def test_shared_tenors_match_statsmodels(curves, frac, it):
+    ttm, spread = curves
+    x, fitted = loess_smooth(ttm, spread, frac=frac, it=it)
+    for row in range(len(spread)):
+        expected = lowess(spread[row], ttm, frac=frac, it=it)
+        np.testing.assert_allclose(x[row], expected[:, 0])
+        np.testing.assert_allclose(fitted[row], expected[:, 1], rtol=1e-7, atol=1e-7)
+
+
+def test_missing_points_and_per_date_tenors_match_statsmodels(curves):
+    ttm, spread = curves
+    rng = np.random.default_rng(3)
+    ttm = ttm - rng.uniform(0, 0.4, spread.shape)  # tenors shorten as the dates go by
+    spread = spread.copy()
+    spread[rng.random(spread.shape) < 0.2] = np.nan
+    x, fitted = loess_smooth(ttm, spread)
+    for row in range(len(spread)):
+        valid = np.isfinite(spread[row])
+        expected = lowess(spread[row][valid], ttm[row][valid], frac=0.3, it=3)
+        np.testing.assert_allclose(x[row][:valid.sum()], expected[:, 0])
+        np.testing.assert_allclose(fitted[row][:valid.sum()], expected[:, 1],
+                                   rtol=1e-7, atol=1e-7)
+        assert np.isnan(fitted[row][valid.sum():]).all()
+
+
+def test_single_curve_matches_batch(curves):
+    ttm, spread = curves
+    batch = fit_spread_curve(ttm, spread)
+    assert batch.shape == (len(spread), len(STANDARD_TENORS))
+    np.testing.assert_allclose(fit_spread_curve(ttm, spread[5]), batch[5])
@@ -0,0 +1,104 @@
+"""daycount against straightforward per-date Python implementations"""
+import calendar
+import datetime
+
+import numpy as np
+import pytest
+
+from daycount import (year_fraction, time_to_maturity, BusinessCalendar,
+                      ACT_365F, ACT_360, THIRTY_360, ACT_ACT, CONVENTIONS, ROLLS)
+
+HOLIDAYS = ['2024-01-01', '2024-03-29', '2024-05-31', '2024-06-03', '2024-12-25', '2025-01-01']
+
+
+def reference_fraction(start, end, convention):
+    days = (end - start).days
+    if convention == ACT_365F:
+        return days / 365
+    if convention == ACT_360:
+        return days / 360
+    if convention == THIRTY_360:
+        d1 = min(start.day, 30)
+        d2 = min(end.day, 30) if d1 == 30 else end.day
+        return (360 * (end.year - start.year) + 30 * (end.month - start.month) + d2 - d1) / 360
+    # ACT/ACT ISDA, day by day
+    step = 1 if end >= start else -1
+    total, day = 0.0, start
+    while day != end:
+        current = day if step > 0 else day - datetime.timedelta(1)
+        total += step / (366 if calendar.isleap(current.year) else 365)
+        day += datetime.timedelta(step)
+    return total
+
+
+@pytest.fixture
+def date_pairs():
+    rng = np.random.default_rng(7)
+    starts = np.datetime64('2019-01-01') + rng.integers(0, 2500, 300)
+    ends = starts + rng.integers(-400, 1500, 300)
+    # Month ends exercise the 30/360 rules
+    extra = np.array(['2020-01-31', '2020-02-29', '2021-05-30', '2023-12-31'], dtype='datetime64[D]')
+    return (np.r_[starts, extra, extra], np.r_[ends, extra[::-1], extra + 31])
+
+
+@pytest.mark.parametrize('convention', CONVENTIONS)
+def test_year_fraction(date_pairs, convention):
+    starts, ends = date_pairs
+    expected = [reference_fraction(s.item(), e.item(), convention) for s, e in zip(starts, ends)]
+    np.testing.assert_allclose(year_fraction(starts, ends, convention), expected, atol=1e-12)
+
+
+def test_unknown_convention():
+    with pytest.raises(ValueError):
+        year_fraction('2024-01-01', '2025-01-01', 'ACT/364')
+
+
+def test_time_to_maturity_grid():
+    maturities = np.array(['2030-06-15', '2027-01-31', '2041-03-01'], dtype='datetime64[D]')
+    valuation = np.array(['2024-01-02', '2024-07-01'], dtype='datetime64[D]')
+    grid = time_to_maturity(maturities, valuation, ACT_ACT)
+    assert grid.shape == (2, 3)
+    for i, v in enumerate(valuation):
+        np.testing.assert_allclose(grid[i], time_to_maturity(maturities, v, ACT_ACT))
+        np.testing.assert_allclose(
+            grid[i], [reference_fraction(v.item(), m.item(), ACT_ACT) for m in maturities])
+
+
+def reference_roll(date, convention, is_business):
+    step = -1 if 'preceding' in convention else 1
+    rolled = date
+    while not is_business(rolled):
+        rolled += datetime.timedelta(step)
+    if convention.startswith('modified_') and rolled.month != date.month:
+        rolled = date
+        while not is_business(rolled):
+            rolled -= datetime.timedelta(step)
+    return rolled
+
+
+@pytest.mark.parametrize('convention', ROLLS)
+def test_roll(convention):
+    cal = BusinessCalendar(HOLIDAYS[::-1] + HOLIDAYS[:2])  # unsorted and duplicated
+    holidays = {datetime.date.fromisoformat(h) for h in HOLIDAYS}
+
+    def is_business(day):
+        return day.weekday() < 5 and day not in holidays
+
+    dates = np.arange('2024-01-01', '2025-01-05', dtype='datetime64[D]')
+    expected = [reference_roll(d.item(), convention, is_business) for d in dates]
+    np.testing.assert_array_equal(cal.roll(dates, convention).astype(object), expected)
+    np.testing.assert_array_equal(cal.is_business_day(dates), [is_business(d.item()) for d in dates])
+
+
+def test_business_days():
+    cal = BusinessCalendar(HOLIDAYS)
+    start = np.datetime64('2024-05-29')
+    assert cal.business_days_between(start, np.datetime64('2024-06-05')) == 3
+    assert cal.add_business_days(start, 2) == np.datetime64('2024-06-04')
+    # A Saturday rolls to Monday first (a holiday here), then to Tuesday
+    assert cal.add_business_days(np.datetime64('2024-06-01'), 0) == np.datetime64('2024-06-04')
+
+
+def test_unknown_roll():
+    with pytest.raises(ValueError):
+        BusinessCalendar().roll(['2024-01-06'], 'nearest')
@@ -0,0 +1,44 @@
+"""rolling.py against pandas' rolling windows"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from rolling import rolling_mean_std, rolling_zscore, rolling_stats
+
+
+@pytest.fixture
+def values():
+    rng = np.random.default_rng(0)
+    values = rng.normal(50, 10, (600, 5)).cumsum(axis=0)
+    values[rng.random(values.shape) < 0.1] = np.nan
+    return values
+
+
+@pytest.mark.parametrize('window', [2, 5, 63, 252, 1000])
+@pytest.mark.parametrize('ddof', [0, 1])
+def test_mean_std_match_pandas(values, window, ddof):
+    rolled = pd.DataFrame(values).rolling(window, min_periods=2)
+    mean, std = rolling_mean_std(values, window, min_periods=2, ddof=ddof)
+    np.testing.assert_allclose(mean, rolled.mean().to_numpy(), rtol=1e-9, atol=1e-9)
+    np.testing.assert_allclose(std, rolled.std(ddof=ddof).to_numpy(), rtol=1e-6, atol=1e-6)
+
+
+def test_one_dimensional_input(values):
+    mean, std = rolling_mean_std(values[:, 0], 20)
+    assert mean.shape == std.shape == (len(values),)
+    np.testing.assert_allclose(mean, rolling_mean_std(values, 20)[0][:, 0])
+
+
+def test_zscore_matches_pandas(values):
+    series = pd.DataFrame(values)
+    rolled = series.rolling(63, min_periods=2)
+    expected = ((series - rolled.mean()) / rolled.std(ddof=0)).to_numpy()
+    np.testing.assert_allclose(rolling_zscore(values, 63), expected, rtol=1e-6, atol=1e-6)
+
+
+def test_stats_match_single_windows(values):
+    for window, (mean, std, zscore) in rolling_stats(values, (20, 63)).items():
+        expected_mean, expected_std = rolling_mean_std(values, window, min_periods=2)
+        np.testing.assert_allclose(mean, expected_mean)
+        np.testing.assert_allclose(std, expected_std)
+        np.testing.assert_allclose(zscore, rolling_zscore(values, window), equal_nan=True)
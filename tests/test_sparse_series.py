@@ -0,0 +1,58 @@
+"""SparseSeries against the same operations on the dense matrix"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from sparse_series import SparseSeries
+
+
+@pytest.fixture
+def dense():
+    rng = np.random.default_rng(4)
+    dates = np.arange('2023-01-02', '2023-12-29', dtype='datetime64[D]')
+    values = rng.integers(-5, 6, (len(dates), 6)).astype(np.float32)
+    values[rng.random(values.shape) < 0.9] = 0
+    values[:, 5] = 0  # an empty column
+    return dates, [f'B{i}' for i in range(6)], values
+
+
+@pytest.fixture
+def series(dense):
+    return SparseSeries.from_dense(*dense, chunk_rows=50)
+
+
+def test_round_trip(dense, series):
+    dates, columns, values = dense
+    np.testing.assert_array_equal(series.to_dense(), values)
+    np.testing.assert_array_equal(series.values, values)
+    assert series.nnz == np.count_nonzero(values)
+    for i, column in enumerate(columns):
+        np.testing.assert_array_equal(series.history(column)[1], values[:, i])
+
+
+def test_totals(dense, series):
+    np.testing.assert_allclose(series.totals(), dense[2].sum(axis=0, dtype=np.float64))
+
+
+@pytest.mark.parametrize('freq,rule', [('W', 'W-MON'), ('M', 'MS')])
+def test_resample_matches_pandas(series, freq, rule):
+    frame = series.to_frame()
+    expected = frame.resample(rule, label='left', closed='left').sum()
+    pd.testing.assert_frame_equal(series.resample(freq).to_frame(), expected, check_freq=False,
+                                  check_dtype=False, check_index_type=False)
+
+
+@pytest.mark.parametrize('window', [1, 5, 21, 400])
+def test_rolling_sum_matches_pandas(series, window):
+    expected = series.to_frame().astype(np.float64).rolling(window, min_periods=1).sum()
+    np.testing.assert_allclose(series.rolling_sum(window).to_dense(), expected.to_numpy(),
+                               atol=1e-4)
+
+
+def test_fingerprint_tracks_content(dense):
+    dates, columns, values = dense
+    a = SparseSeries.from_dense(dates, columns, values)
+    changed = values.copy()
+    changed[0, 0] += 1
+    assert a.fingerprint() == SparseSeries.from_dense(dates, columns, values).fingerprint()
+    assert a.fingerprint() != SparseSeries.from_dense(dates, columns, changed).fingerprint()
@@ -0,0 +1,51 @@
+"""ZScoreEngine: incremental updates against a full recompute and pandas"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from rolling import HORIZON_WINDOWS
+from zscores import ZScoreEngine, FULL_HISTORY_COLUMN, compute_basis_zscores
+
+
+@pytest.fixture
+def values():
+    rng = np.random.default_rng(1)
+    values = rng.normal(0, 1, (500, 8)).cumsum(axis=0) + 100
+    values[rng.random(values.shape) < 0.05] = np.nan
+    values[:, 7] = 5.0  # flat bond, no z-score
+    return values
+
+
+def test_append_matches_full_recompute(values):
+    bonds = [f'B{i}' for i in range(values.shape[1])]
+    engine = ZScoreEngine(values[:300], bonds)
+    for row in values[300:]:
+        engine.append(row)
+    expected = ZScoreEngine(values, bonds).zscores()
+    for column, scores in engine.zscores().items():
+        np.testing.assert_allclose(scores, expected[column], rtol=1e-9, atol=1e-9,
+                                   err_msg=column)
+
+
+def test_append_to_short_history(values):
+    bonds = [f'B{i}' for i in range(values.shape[1])]
+    engine = ZScoreEngine(values[:10], bonds)
+    for row in values[10:]:
+        engine.append(row)
+    expected = ZScoreEngine(values, bonds).zscores()
+    for column, scores in engine.zscores().items():
+        np.testing.assert_allclose(scores, expected[column], rtol=1e-9, atol=1e-9,
+                                   err_msg=column)
+
+
+def test_matches_pandas(values):
+    frame = compute_basis_zscores(values, [f'B{i}' for i in range(values.shape[1])])
+    history = pd.DataFrame(values)
+    last = history.iloc[-1]
+    for column, window in HORIZON_WINDOWS.items():
+        tail = history.tail(window)
+        expected = ((last - tail.mean()) / tail.std(ddof=0)).to_numpy()
+        np.testing.assert_allclose(frame[column], expected, rtol=1e-6, equal_nan=True)
+    expected = ((last - history.mean()) / history.std(ddof=0)).to_numpy()
+    np.testing.assert_allclose(frame[FULL_HISTORY_COLUMN], expected, rtol=1e-6, equal_nan=True)
+    assert np.isnan(frame[FULL_HISTORY_COLUMN][7])
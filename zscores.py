@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+
+from rolling import HORIZON_WINDOWS
+
+# Column holding the z-score against each bond's full history
+FULL_HISTORY_COLUMN = 'sigma'
+
+
+class ZScoreEngine:
+    """Current basis z-scores for every bond over several horizons.
+
+    Built from a date x bond matrix, it keeps running counts, sums and
+    sums of squares for each trailing window and for the full history,
+    plus a ring buffer of the last rows needed to drop observations that
+    leave a window. `append` then updates every statistic in O(bonds)
+    per window. NaNs are treated as missing observations.
+    """
+
+    def __init__(self, values, bonds, windows=HORIZON_WINDOWS):
+        values = np.asarray(values, dtype=np.float64)
+        if values.ndim != 2 or values.shape[1] != len(bonds):
+            raise ValueError("values must be a date x bond matrix matching bonds")
+        self.bonds = list(bonds)
+        self.windows = dict(windows)
+        depth = max(self.windows.values())
+
+        # Center on each bond's mean so the squared sums stay well conditioned
+        finite = np.isfinite(values)
+        with np.errstate(invalid='ignore'):
+            reference = np.nanmean(np.where(finite, values, np.nan), axis=0)
+        self._reference = np.where(np.isfinite(reference), reference, 0.0)
+        centered = np.where(finite, values - self._reference, 0.0)
+
+        self._full = self._moments(centered, finite)
+        self._sums = {w: self._moments(centered[-w:], finite[-w:])
+                      for w in self.windows.values()}
+
+        # Ring buffer of the last `depth` rows, oldest first and zero-padded
+        m = values.shape[1]
+        self._ring = np.zeros((depth, m))
+        self._ring_finite = np.zeros((depth, m), dtype=bool)
+        tail = min(depth, len(values))
+        if tail:
+            self._ring[depth - tail:] = centered[-tail:]
+            self._ring_finite[depth - tail:] = finite[-tail:]
+        self._head = 0
+        self._last = values[-1].copy() if len(values) else np.full(m, np.nan)
+
+    @staticmethod
+    def _moments(centered, finite):
+        return np.stack([finite.sum(axis=0), centered.sum(axis=0),
+                         (centered * centered).sum(axis=0)]).astype(np.float64)
+
+    def append(self, row):
+        """Adds one day's basis values for every bond"""
+        row = np.asarray(row, dtype=np.float64)
+        finite = np.isfinite(row)
+        centered = np.where(finite, row - self._reference, 0.0)
+        added = np.stack([finite, centered, centered * centered])
+
+        depth = len(self._ring)
+        for w, sums in self._sums.items():
+            i = (self._head - w) % depth
+            old = self._ring[i]
+            sums += added
+            sums -= np.stack([self._ring_finite[i], old, old * old])
+        self._full += added
+
+        self._ring[self._head] = centered
+        self._ring_finite[self._head] = finite
+        self._head = (self._head + 1) % depth
+        self._last = row
+
+    def _zscore(self, sums):
+        count, total, total_sq = sums
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = total / count
+            std = np.sqrt(np.maximum(total_sq / count - mean * mean, 0.0))
+            z = (self._last - self._reference - mean) / std
+        return np.where((count >= 2) & (std > 0), z, np.nan)
+
+    def zscores(self):
+        """Returns a {column: array} mapping of current z-scores"""
+        scores = {FULL_HISTORY_COLUMN: self._zscore(self._full)}
+        for name, w in self.windows.items():
+            scores[name] = self._zscore(self._sums[w])
+        return scores
+
+    def frame(self):
+        """Returns the z-scores as a table ready for BasisStore.update"""
+        return pd.DataFrame({'Bond': self.bonds, **self.zscores()})
+
+
+def compute_basis_zscores(values, bonds, windows=HORIZON_WINDOWS):
+    """Computes every bond's current z-scores over all horizons in one pass"""
+    return ZScoreEngine(values, bonds, windows).frame()